@@ -3,6 +3,7 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from app.config import config
+from app.utils.json_provider import FastJSONProvider
 import os
 
 db = SQLAlchemy()
@@ -15,9 +16,23 @@ def create_app(config_name=None):
     
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    app.json = FastJSONProvider(app)
     
     # Initialize extensions
+    from app.utils.db_pool import InstrumentedQueuePool, pool_telemetry
+    engine_options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    engine_options.setdefault('poolclass', InstrumentedQueuePool)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+    
+    from app.utils.token_cache import verified_tokens
+    verified_tokens.init_app(app)
+    
     db.init_app(app)
+    with app.app_context():
+        pool_telemetry.init_app(app, db.engine)
+        if app.config['METRICS_ENABLED']:
+            from app.utils.metrics import request_metrics
+            request_metrics.init_app(app, db.engine)
     migrate.init_app(app, db)
     CORS(app, origins=app.config['CORS_ORIGINS'], supports_credentials=True)
     
@@ -26,11 +41,17 @@ def create_app(config_name=None):
     from app.routes.employee import employee_bp
     from app.routes.manager import manager_bp
     from app.routes.admin import admin_bp
+    from app.routes.batch import batch_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(employee_bp, url_prefix='/api/employee')
     app.register_blueprint(manager_bp, url_prefix='/api/manager')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
+    app.register_blueprint(batch_bp, url_prefix='/api/batch')
+    
+    # CLI commands
+    from app.commands import register_commands
+    register_commands(app)
     
     # Health check endpoint
     @app.route('/health')
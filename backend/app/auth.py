@@ -1,7 +1,15 @@
+import logging
+import threading
+import time
+import jwt
+from jwt.algorithms import RSAAlgorithm
 from flask import request, jsonify, current_app, g
 from functools import wraps
 from keycloak import KeycloakOpenID
 from keycloak.exceptions import KeycloakConnectionError, KeycloakGetError
+from app.utils.token_cache import verified_tokens
+
+logger = logging.getLogger(__name__)
 
 def get_keycloak_openid():
     return KeycloakOpenID(
@@ -11,38 +19,147 @@ def get_keycloak_openid():
         client_secret_key=current_app.config['KEYCLOAK_CLIENT_SECRET']
     )
 
+def fetch_realm_signing_keys(keycloak_openid):
+    """Fetch the realm's RSA signing keys from the JWKS endpoint, keyed by kid"""
+    keys = {}
+    for jwk in keycloak_openid.certs().get('keys', []):
+        if jwk.get('kty') != 'RSA' or jwk.get('use', 'sig') != 'sig':
+            continue
+        keys[jwk['kid']] = RSAAlgorithm.from_jwk(jwk)
+    return keys
+
+class SigningKeyCache:
+    """Process-wide cache of realm signing keys keyed by kid.
+
+    Keys are served from memory for ``ttl`` seconds. After that the stale keys
+    keep being served while a background thread refreshes them, up to
+    ``max_stale`` extra seconds, after which the refresh happens inline. An
+    unknown kid forces a refetch (at most once per ``min_refetch_interval``)
+    so key rotation in Keycloak is picked up without waiting for the TTL.
+    """
+
+    def __init__(self):
+        self._keys = {}
+        self._fetched_at = None
+        self._last_forced_at = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def get(self, kid, fetch, ttl, max_stale, min_refetch_interval):
+        """Return the public key for ``kid`` or None if the realm doesn't know it"""
+        now = time.monotonic()
+        age = None if self._fetched_at is None else now - self._fetched_at
+
+        if age is None or age > ttl + max_stale:
+            self.refresh(fetch)
+        elif age > ttl:
+            self._refresh_in_background(fetch)
+
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        # Unknown kid: the realm may have rotated its keys
+        with self._lock:
+            if self._last_forced_at is not None and now - self._last_forced_at < min_refetch_interval:
+                return None
+            self._last_forced_at = now
+        self.refresh(fetch)
+        return self._keys.get(kid)
+
+    def refresh(self, fetch):
+        """Synchronously replace the cached keys with a fresh fetch"""
+        keys = fetch()
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._keys = {}
+            self._fetched_at = None
+            self._last_forced_at = None
+
+    def _refresh_in_background(self, fetch):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh(fetch)
+            except Exception as e:
+                # Keep serving the stale keys; the next request past max_stale retries inline
+                logger.warning('Background refresh of Keycloak signing keys failed: %s', e)
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name='keycloak-jwks-refresh', daemon=True).start()
+
+signing_keys = SigningKeyCache()
+
+def get_signing_key(kid):
+    """Look up a realm signing key through the process-wide cache"""
+    app = current_app._get_current_object()
+    config = app.config
+
+    def fetch():
+        # May run on the background refresh thread, outside the request context
+        with app.app_context():
+            return fetch_realm_signing_keys(get_keycloak_openid())
+
+    return signing_keys.get(
+        kid,
+        fetch=fetch,
+        ttl=config['KEYCLOAK_JWKS_TTL_SECONDS'],
+        max_stale=config['KEYCLOAK_JWKS_MAX_STALE_SECONDS'],
+        min_refetch_interval=config['KEYCLOAK_JWKS_MIN_REFETCH_SECONDS']
+    )
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
+        # Sub-requests of /api/batch reuse the batch request's verified user
+        batch_user = g.get('batch_user')
+        if batch_user is not None:
+            g.user = batch_user
+            return f(*args, **kwargs)
+
         token = None
         auth_header = request.headers.get('Authorization')
-        
+
         if auth_header and auth_header.startswith('Bearer '):
             token = auth_header.split(' ')[1]
-        
+
         if not token:
             return jsonify({'message': 'Token is missing!'}), 401
-        
+
         try:
-            keycloak_openid = get_keycloak_openid()
             # method 1: introspect (online validation)
-            # token_info = keycloak_openid.introspect(token)
+            # token_info = get_keycloak_openid().introspect(token)
             # if not token_info.get('active'):
             #    return jsonify({'message': 'Token is invalid or expired'}), 401
-            
-            # method 2: decode (offline validation using public key)
-            # Fetch public key from Keycloak
-            KEYCLOAK_PUBLIC_KEY = "-----BEGIN PUBLIC KEY-----\n" + keycloak_openid.public_key() + "\n-----END PUBLIC KEY-----"
-            
-            options = {"verify_signature": True, "verify_aud": False, "exp": True}
-            token_info = keycloak_openid.decode_token(token, key=KEYCLOAK_PUBLIC_KEY, options=options)
-            
+
+            # method 2: decode (offline validation using the cached realm signing keys)
+            token_info = verified_tokens.get('keycloak', token)
+            if token_info is None:
+                kid = jwt.get_unverified_header(token).get('kid')
+                public_key = get_signing_key(kid)
+                if public_key is None:
+                    return jsonify({'message': 'Token is invalid: unknown signing key'}), 401
+
+                options = {"verify_signature": True, "verify_aud": False, "verify_exp": True}
+                token_info = jwt.decode(token, key=public_key, algorithms=['RS256'], options=options)
+                verified_tokens.put('keycloak', token, token_info)
+
             # Add user info to request context
             g.user = token_info
-            
+
         except Exception as e:
             return jsonify({'message': f'Token is invalid: {str(e)}'}), 401
-            
+
         return f(*args, **kwargs)
-    
+
     return decorated
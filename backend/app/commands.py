@@ -0,0 +1,44 @@
+import click
+from flask.cli import AppGroup
+from app.services.job_service import JobService
+from app.services.reconciliation_service import ReconciliationService
+from app.services.attendance_rollup_service import AttendanceRollupService
+from benchmarks.cli import bench_cli
+
+jobs_cli = AppGroup('jobs', help='Background import jobs')
+
+@jobs_cli.command('resume')
+def resume_jobs():
+    """Process import jobs that were still queued, or stalled mid-run, when the server stopped"""
+    count = JobService.resume_queued()
+    click.echo(f'Processed {count} queued import job(s)')
+
+leave_cli = AppGroup('leave', help='Leave data maintenance')
+
+@leave_cli.command('reconcile')
+@click.option('--location-id', 'location_ids', multiple=True, help='Limit to a location (repeatable)')
+def reconcile_leave(location_ids):
+    """Recompute working days of open leave requests and fix balances"""
+    report = ReconciliationService.reconcile_leave_totals(list(location_ids) or None)
+    click.echo(
+        f"Checked {report['requests_checked']} request(s), updated {report['requests_updated']}, "
+        f"adjusted {report['balances_updated']} balance(s)"
+    )
+
+attendance_cli = AppGroup('attendance', help='Attendance data maintenance')
+
+@attendance_cli.command('rebuild-rollup')
+@click.option('--year', type=int, help='Only rebuild this year')
+@click.option('--month', type=int, help='Only rebuild this month (requires --year)')
+def rebuild_rollup(year, month):
+    """Rebuild attendance_monthly_rollup from attendance_records"""
+    if month is not None and year is None:
+        raise click.UsageError('--month requires --year')
+    count = AttendanceRollupService.rebuild(year, month)
+    click.echo(f'Rebuilt {count} monthly rollup row(s)')
+
+def register_commands(app):
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(leave_cli)
+    app.cli.add_command(attendance_cli)
+    app.cli.add_command(bench_cli)
@@ -2,7 +2,9 @@
 from app.models.user import User, Location
 from app.models.leave import LeaveType, LeaveBalance, LeaveRequest
 from app.models.holiday import Holiday, location_holidays
-from app.models.attendance import AttendanceRecord
+from app.models.attendance import AttendanceRecord, AttendanceMonthlyRollup
+from app.models.job import ImportJob
+from app.models.version import ResourceVersion
 
 __all__ = [
     'User',
@@ -12,5 +14,8 @@ __all__ = [
     'LeaveRequest',
     'Holiday',
     'location_holidays',
-    'AttendanceRecord'
+    'AttendanceRecord',
+    'AttendanceMonthlyRollup',
+    'ImportJob',
+    'ResourceVersion'
 ]
@@ -4,6 +4,7 @@ from app import db
 
 class AttendanceRecord(db.Model):
     __tablename__ = 'attendance_records'
+    # _user_date_uc also serves as the (user_id, date) index for per-user date range scans
     __table_args__ = (db.UniqueConstraint('user_id', 'date', name='_user_date_uc'),)
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -49,8 +50,7 @@ class AttendanceRecord(db.Model):
         }
         
         if include_user:
-            from app.models.user import User
-            user = User.query.get(self.user_id)
+            user = self.user
             if user:
                 data['employee'] = {
                     'id': user.id,
@@ -59,3 +59,32 @@ class AttendanceRecord(db.Model):
                 }
         
         return data
+
+class AttendanceMonthlyRollup(db.Model):
+    """Per-user monthly attendance counts, kept in step with attendance_records"""
+    __tablename__ = 'attendance_monthly_rollup'
+    __table_args__ = (db.Index('ix_attendance_monthly_rollup_year_month', 'year', 'month'),)
+    
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), primary_key=True)
+    year = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Integer, primary_key=True)
+    total_days = db.Column(db.Integer, nullable=False, default=0)
+    present = db.Column(db.Integer, nullable=False, default=0)
+    absent = db.Column(db.Integer, nullable=False, default=0)
+    half_day = db.Column(db.Integer, nullable=False, default=0)
+    on_leave = db.Column(db.Integer, nullable=False, default=0)
+    total_work_hours = db.Column(db.Numeric(7, 2), nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'year': self.year,
+            'month': self.month,
+            'total_days': self.total_days,
+            'present': self.present,
+            'absent': self.absent,
+            'half_day': self.half_day,
+            'on_leave': self.on_leave,
+            'total_work_hours': float(self.total_work_hours or 0)
+        }
@@ -24,7 +24,10 @@ class LeaveType(db.Model):
 
 class LeaveBalance(db.Model):
     __tablename__ = 'leave_balances'
-    __table_args__ = (db.UniqueConstraint('user_id', 'leave_type_id', 'year', name='_user_leave_year_uc'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'leave_type_id', 'year', name='_user_leave_year_uc'),
+        db.Index('ix_leave_balances_user_year', 'user_id', 'year'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -60,6 +63,12 @@ class LeaveBalance(db.Model):
 
 class LeaveRequest(db.Model):
     __tablename__ = 'leave_requests'
+    __table_args__ = (
+        db.Index('ix_leave_requests_user_created', 'user_id', 'created_at'),
+        db.Index('ix_leave_requests_user_status_created', 'user_id', 'status', 'created_at'),
+        db.Index('ix_leave_requests_status_user', 'status', 'user_id'),
+        db.Index('ix_leave_requests_user_start_date', 'user_id', 'start_date'),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
@@ -100,8 +109,7 @@ class LeaveRequest(db.Model):
         }
         
         if include_user:
-            from app.models.user import User
-            user = User.query.get(self.user_id)
+            user = self.employee
             if user:
                 data['employee'] = {
                     'id': user.id,
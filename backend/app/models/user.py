@@ -4,6 +4,14 @@ from app import db
 
 class User(db.Model):
     __tablename__ = 'users'
+    # Trigram indexes (require the pg_trgm extension) serve ILIKE '%term%' search on Postgres
+    __table_args__ = (
+        db.Index('ix_users_email_trgm', 'email', postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'}),
+        db.Index('ix_users_first_name_trgm', 'first_name', postgresql_using='gin',
+                 postgresql_ops={'first_name': 'gin_trgm_ops'}),
+        db.Index('ix_users_last_name_trgm', 'last_name', postgresql_using='gin',
+                 postgresql_ops={'last_name': 'gin_trgm_ops'}),
+    )
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     email = db.Column(db.String(255), unique=True, nullable=False, index=True)
@@ -11,7 +19,7 @@ class User(db.Model):
     first_name = db.Column(db.String(100), nullable=False)
     last_name = db.Column(db.String(100), nullable=False)
     role = db.Column(db.Enum('employee', 'manager', 'admin', name='user_roles'), nullable=False, default='employee')
-    manager_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
+    manager_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True, index=True)
     location_id = db.Column(db.String(36), db.ForeignKey('locations.id'), nullable=False)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -39,6 +47,14 @@ class User(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+# Prefix indexes for autocomplete (lower(column) LIKE 'term%')
+db.Index('ix_users_email_prefix', db.func.lower(User.email).label('email_lower'),
+         postgresql_ops={'email_lower': 'text_pattern_ops'})
+db.Index('ix_users_first_name_prefix', db.func.lower(User.first_name).label('first_name_lower'),
+         postgresql_ops={'first_name_lower': 'text_pattern_ops'})
+db.Index('ix_users_last_name_prefix', db.func.lower(User.last_name).label('last_name_lower'),
+         postgresql_ops={'last_name_lower': 'text_pattern_ops'})
+
 class Location(db.Model):
     __tablename__ = 'locations'
     
@@ -0,0 +1,10 @@
+from datetime import datetime
+from app import db
+
+class ResourceVersion(db.Model):
+    """Version counter per slowly-changing resource, bumped in the transaction that changes it"""
+    __tablename__ = 'resource_versions'
+    
+    name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
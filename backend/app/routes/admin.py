@@ -1,13 +1,26 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
-from app.utils.decorators import require_role
+from app.utils.decorators import require_role, get_current_user
 from app.auth import token_required
 from app.models.user import User, Location
 from app.models.leave import LeaveBalance, LeaveType, LeaveRequest
 from app.models.holiday import Holiday
-from app.models.attendance import AttendanceRecord
+from app.models.attendance import AttendanceMonthlyRollup
+from app.models.job import ImportJob
+from app.services.job_service import JobService
+from app.services.holiday_calendar import holiday_calendar
+from app.services.reconciliation_service import ReconciliationService
+from app.utils.serializers import (
+    USER_EXTRAS, USER_FIELDS, serialize_holidays, serialize_locations, serialize_users, user_export_columns
+)
+from app.utils.fieldsets import InvalidFields, load_fields, requested_fields
+from app.utils.dates import in_date_window
+from app.utils.pagination import paginate_request, InvalidCursor
+from app.utils.export import requested_export_format, stream_export
+from app.utils.search import user_search_filter, user_prefix_filter
+from app.utils.db_pool import pool_telemetry
+from app.utils.conditional import bump_resource_version, conditional_response, make_etag, resource_version
 from app import db
-import pandas as pd
 import os
 from werkzeug.utils import secure_filename
 
@@ -24,22 +37,19 @@ def allowed_file(filename):
 @require_role('admin')
 def get_users():
     """Get all users with pagination"""
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 50, type=int)
     search = request.args.get('search', '')
     role = request.args.get('role')
     location_id = request.args.get('location_id')
     
+    try:
+        fields = requested_fields(USER_FIELDS + ('full_name',))
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    
     query = User.query
     
     if search:
-        query = query.filter(
-            db.or_(
-                User.email.ilike(f'%{search}%'),
-                User.first_name.ilike(f'%{search}%'),
-                User.last_name.ilike(f'%{search}%')
-            )
-        )
+        query = query.filter(user_search_filter(search))
     
     if role:
         query = query.filter_by(role=role)
@@ -47,16 +57,56 @@ def get_users():
     if location_id:
         query = query.filter_by(location_id=location_id)
     
-    query = query.order_by(User.created_at.desc())
+    keyset = [(User.created_at, 'desc'), (User.id, 'desc')]
+    query = load_fields(query, User, fields, USER_FIELDS, USER_EXTRAS, required=[c for c, _ in keyset])
+    
+    export_format = requested_export_format()
+    if export_format:
+        return stream_export(
+            query.order_by(User.created_at.desc(), User.id.desc()),
+            lambda users: serialize_users(users, fields=fields),
+            export_format,
+            'users',
+            user_export_columns(fields)
+        )
+    
+    try:
+        items, page_info = paginate_request(query, keyset, default_per_page=50)
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'users': serialize_users(items, fields=fields),
+        **page_info
+    }), 200
+
+@admin_bp.route('/users/suggest', methods=['GET'])
+@token_required
+@require_role('admin')
+def suggest_users():
+    """Autocomplete users by email or name prefix"""
+    term = request.args.get('q', '').strip()
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    
+    if not term:
+        return jsonify({'suggestions': []}), 200
     
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Column-only query: no ORM hydration on the keystroke path
+    rows = db.session.query(
+        User.id,
+        User.email,
+        User.first_name,
+        User.last_name
+    ).filter(
+        user_prefix_filter(term),
+        User.is_active.is_(True)
+    ).order_by(User.last_name, User.first_name).limit(limit).all()
     
     return jsonify({
-        'users': [user.to_dict() for user in pagination.items],
-        'total': pagination.total,
-        'page': page,
-        'per_page': per_page,
-        'pages': pagination.pages
+        'suggestions': [
+            {'id': r.id, 'name': f"{r.first_name} {r.last_name}", 'email': r.email}
+            for r in rows
+        ]
     }), 200
 
 @admin_bp.route('/users', methods=['POST'])
@@ -144,73 +194,45 @@ def bulk_upload_users():
     if not allowed_file(file.filename):
         return jsonify({'error': 'Invalid file type. Only CSV and Excel files are allowed'}), 400
     
-    try:
-        # Read file
-        if file.filename.endswith('.csv'):
-            df = pd.read_csv(file)
-        else:
-            df = pd.read_excel(file)
-        
-        # Validate columns
-        required_columns = ['email', 'first_name', 'last_name', 'role', 'location_id']
-        if not all(col in df.columns for col in required_columns):
-            return jsonify({'error': f'Missing required columns. Required: {required_columns}'}), 400
-        
-        results = {'success': [], 'errors': []}
-        
-        for idx, row in df.iterrows():
-            try:
-                # Check if user exists
-                if User.query.filter_by(email=row['email']).first():
-                    results['errors'].append({
-                        'row': idx + 2,
-                        'email': row['email'],
-                        'error': 'User already exists'
-                    })
-                    continue
-                
-                user = User(
-                    email=row['email'],
-                    first_name=row['first_name'],
-                    last_name=row['last_name'],
-                    role=row['role'],
-                    location_id=row['location_id'],
-                    manager_id=row.get('manager_id') if pd.notna(row.get('manager_id')) else None
-                )
-                
-                db.session.add(user)
-                results['success'].append(row['email'])
-            
-            except Exception as e:
-                results['errors'].append({
-                    'row': idx + 2,
-                    'email': row.get('email', 'N/A'),
-                    'error': str(e)
-                })
-        
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'Bulk upload completed',
-            'total_processed': len(df),
-            'successful': len(results['success']),
-            'failed': len(results['errors']),
-            'results': results
-        }), 200
+    job = JobService.submit('users', file, created_by_id=(get_current_user() or {}).get('user_id'))
+    
+    return jsonify({
+        'message': 'Bulk upload accepted',
+        'job': job.to_dict()
+    }), 202
+
+# Bulk Upload Jobs
+@admin_bp.route('/jobs/<job_id>', methods=['GET'])
+@token_required
+@require_role('admin')
+def get_import_job(job_id):
+    """Get progress and the row-level error report of a bulk upload job"""
+    job = ImportJob.query.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
     
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': f'Failed to process file: {str(e)}'}), 400
+    return jsonify(job.to_dict(include_errors=True)), 200
+
+# System
+@admin_bp.route('/system/db-pool', methods=['GET'])
+@token_required
+@require_role('admin')
+def get_db_pool_stats():
+    """Connection pool telemetry: checkouts, wait time, overflow and connection age"""
+    return jsonify(pool_telemetry.stats()), 200
 
 # Location Management
 @admin_bp.route('/locations', methods=['GET'])
 @require_role('admin')
 def get_locations():
     """Get all locations"""
-    locations = Location.query.all()
-    return jsonify({
-        'locations': [loc.to_dict() for loc in locations]
-    }), 200
+    def build():
+        locations = Location.query.all()
+        return jsonify({
+            'locations': serialize_locations(locations)
+        }), 200
+    
+    return conditional_response(make_etag('locations', resource_version('locations')), build)
 
 @admin_bp.route('/locations', methods=['POST'])
 @require_role('admin')
@@ -234,6 +256,7 @@ def create_location():
     )
     
     db.session.add(location)
+    bump_resource_version('locations')
     db.session.commit()
     
     return jsonify(location.to_dict()), 201
@@ -245,18 +268,23 @@ def get_holidays():
     """Get all holidays"""
     year = request.args.get('year', type=int)
     
-    query = Holiday.query
-    
-    if year:
-        query = query.filter(db.extract('year', Holiday.date) == year)
+    etag = make_etag('admin-holidays', year, resource_version('holidays'), resource_version('locations'))
     
-    query = query.order_by(Holiday.date)
-    
-    holidays = query.all()
+    def build():
+        query = Holiday.query
+        
+        if year:
+            query = query.filter(in_date_window(Holiday.date, year))
+        
+        query = query.order_by(Holiday.date)
+        
+        holidays = query.all()
+        
+        return jsonify({
+            'holidays': serialize_holidays(holidays, include_locations=True)
+        }), 200
     
-    return jsonify({
-        'holidays': [h.to_dict(include_locations=True) for h in holidays]
-    }), 200
+    return conditional_response(etag, build)
 
 @admin_bp.route('/holidays', methods=['POST'])
 @require_role('admin')
@@ -281,7 +309,9 @@ def create_holiday():
     )
     
     db.session.add(holiday)
+    bump_resource_version('holidays')
     db.session.commit()
+    holiday_calendar.invalidate()
     
     return jsonify(holiday.to_dict()), 201
 
@@ -295,6 +325,8 @@ def update_holiday(holiday_id):
     
     data = request.get_json()
     
+    original_date = holiday.date
+    
     if 'name' in data:
         holiday.name = data['name']
     if 'date' in data:
@@ -307,7 +339,16 @@ def update_holiday(holiday_id):
     if 'description' in data:
         holiday.description = data['description']
     
+    date_changed = holiday.date != original_date
+    location_ids = [loc.id for loc in holiday.locations]
+    
+    bump_resource_version('holidays')
     db.session.commit()
+    holiday_calendar.invalidate()
+    
+    # Moving a holiday changes the working-day count of open requests around it
+    if date_changed and location_ids:
+        ReconciliationService.reconcile_leave_totals(location_ids)
     
     return jsonify(holiday.to_dict()), 200
 
@@ -319,8 +360,15 @@ def delete_holiday(holiday_id):
     if not holiday:
         return jsonify({'error': 'Holiday not found'}), 404
     
+    location_ids = [loc.id for loc in holiday.locations]
+    
     db.session.delete(holiday)
+    bump_resource_version('holidays')
     db.session.commit()
+    holiday_calendar.invalidate()
+    
+    if location_ids:
+        ReconciliationService.reconcile_leave_totals(location_ids)
     
     return jsonify({'message': 'Holiday deleted successfully'}), 200
 
@@ -346,7 +394,10 @@ def assign_holidays_to_location(location_id):
         if holiday:
             location.holidays.append(holiday)
     
+    bump_resource_version('holidays')
     db.session.commit()
+    holiday_calendar.invalidate(location_id)
+    ReconciliationService.reconcile_leave_totals([location_id])
     
     return jsonify({
         'message': 'Holidays assigned successfully',
@@ -354,6 +405,21 @@ def assign_holidays_to_location(location_id):
         'holidays': [h.to_dict() for h in location.holidays]
     }), 200
 
+@admin_bp.route('/leave/reconcile', methods=['POST'])
+@token_required
+@require_role('admin')
+def reconcile_leave_totals():
+    """Recompute working days of open leave requests after holiday changes"""
+    data = request.get_json(silent=True) or {}
+    location_ids = data.get('location_ids')
+    
+    if location_ids is not None and not isinstance(location_ids, list):
+        return jsonify({'error': 'location_ids must be a list'}), 400
+    
+    report = ReconciliationService.reconcile_leave_totals(location_ids)
+    
+    return jsonify(report), 200
+
 # Leave Balance Management
 @admin_bp.route('/leave-balances/allocate', methods=['POST'])
 @require_role('admin')
@@ -389,6 +455,27 @@ def allocate_leave_balances():
     return jsonify(balance.to_dict()), 200
 
 # Attendance Management
+ATTENDANCE_REPORT_COLUMNS = (
+    'employee.id', 'employee.name', 'employee.email', 'employee.location',
+    'total_days', 'present', 'absent', 'half_day', 'on_leave', 'total_work_hours'
+)
+
+def _attendance_report_row(r):
+    return {
+        'employee': {
+            'id': r.id,
+            'name': f"{r.first_name} {r.last_name}",
+            'email': r.email,
+            'location': r.location_name
+        },
+        'total_days': r.total_days or 0,
+        'present': r.present or 0,
+        'absent': r.absent or 0,
+        'half_day': r.half_day or 0,
+        'on_leave': r.on_leave or 0,
+        'total_work_hours': float(r.total_work_hours or 0)
+    }
+
 @admin_bp.route('/attendance/reports', methods=['GET'])
 @require_role('admin')
 def get_attendance_reports():
@@ -403,44 +490,37 @@ def get_attendance_reports():
         User.last_name,
         User.email,
         Location.name.label('location_name'),
-        db.func.count(AttendanceRecord.id).label('total_days'),
-        db.func.sum(db.case((AttendanceRecord.status == 'present', 1), else_=0)).label('present'),
-        db.func.sum(db.case((AttendanceRecord.status == 'absent', 1), else_=0)).label('absent'),
-        db.func.sum(db.case((AttendanceRecord.status == 'half_day', 1), else_=0)).label('half_day'),
-        db.func.sum(db.case((AttendanceRecord.status == 'on_leave', 1), else_=0)).label('on_leave'),
-        db.func.sum(AttendanceRecord.work_hours).label('total_work_hours')
+        AttendanceMonthlyRollup.total_days,
+        AttendanceMonthlyRollup.present,
+        AttendanceMonthlyRollup.absent,
+        AttendanceMonthlyRollup.half_day,
+        AttendanceMonthlyRollup.on_leave,
+        AttendanceMonthlyRollup.total_work_hours
     ).join(
-        AttendanceRecord, User.id == AttendanceRecord.user_id
+        AttendanceMonthlyRollup, User.id == AttendanceMonthlyRollup.user_id
     ).join(
         Location, User.location_id == Location.id
     ).filter(
-        db.extract('year', AttendanceRecord.date) == year,
-        db.extract('month', AttendanceRecord.date) == month
+        AttendanceMonthlyRollup.year == year,
+        AttendanceMonthlyRollup.month == month
     )
     
     if location_id:
         query = query.filter(User.location_id == location_id)
     
-    query = query.group_by(User.id, Location.name).order_by(User.last_name, User.first_name)
+    query = query.order_by(User.last_name, User.first_name, User.id)
     
-    results = query.all()
+    export_format = requested_export_format()
+    if export_format:
+        return stream_export(
+            query,
+            lambda rows: [_attendance_report_row(r) for r in rows],
+            export_format,
+            f'attendance-report-{year}-{month:02d}',
+            ATTENDANCE_REPORT_COLUMNS
+        )
     
-    report = []
-    for r in results:
-        report.append({
-            'employee': {
-                'id': r.id,
-                'name': f"{r.first_name} {r.last_name}",
-                'email': r.email,
-                'location': r.location_name
-            },
-            'total_days': r.total_days or 0,
-            'present': r.present or 0,
-            'absent': r.absent or 0,
-            'half_day': r.half_day or 0,
-            'on_leave': r.on_leave or 0,
-            'total_work_hours': float(r.total_work_hours or 0)
-        })
+    report = [_attendance_report_row(r) for r in query.all()]
     
     return jsonify({
         'month': month,
@@ -460,59 +540,12 @@ def bulk_upload_attendance():
     if not allowed_file(file.filename):
         return jsonify({'error': 'Invalid file type'}), 400
     
-    try:
-        if file.filename.endswith('.csv'):
-            df = pd.read_csv(file)
-        else:
-            df = pd.read_excel(file)
-        
-        required_columns = ['user_id', 'date', 'status']
-        if not all(col in df.columns for col in required_columns):
-            return jsonify({'error': f'Missing required columns. Required: {required_columns}'}), 400
-        
-        results = {'success': [], 'errors': []}
-        
-        for idx, row in df.iterrows():
-            try:
-                attendance_date = pd.to_datetime(row['date']).date()
-                
-                existing = AttendanceRecord.query.filter_by(
-                    user_id=row['user_id'],
-                    date=attendance_date
-                ).first()
-                
-                if existing:
-                    existing.status = row['status']
-                    existing.notes = row.get('notes')
-                else:
-                    record = AttendanceRecord(
-                        user_id=row['user_id'],
-                        date=attendance_date,
-                        status=row['status'],
-                        notes=row.get('notes')
-                    )
-                    db.session.add(record)
-                
-                results['success'].append(f"{row['user_id']} - {attendance_date}")
-            
-            except Exception as e:
-                results['errors'].append({
-                    'row': idx + 2,
-                    'error': str(e)
-                })
-        
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'Bulk upload completed',
-            'successful': len(results['success']),
-            'failed': len(results['errors']),
-            'results': results
-        }), 200
+    job = JobService.submit('attendance', file, created_by_id=(get_current_user() or {}).get('user_id'))
     
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': f'Failed to process file: {str(e)}'}), 400
+    return jsonify({
+        'message': 'Bulk upload accepted',
+        'job': job.to_dict()
+    }), 202
 
 @admin_bp.route('/attendance/defaulters', methods=['GET'])
 @require_role('admin')
@@ -528,15 +561,14 @@ def get_attendance_defaulters():
         User.first_name,
         User.last_name,
         User.email,
-        db.func.sum(db.case((AttendanceRecord.status == 'absent', 1), else_=0)).label('absent_days')
+        AttendanceMonthlyRollup.absent.label('absent_days')
     ).join(
-        AttendanceRecord, User.id == AttendanceRecord.user_id
+        AttendanceMonthlyRollup, User.id == AttendanceMonthlyRollup.user_id
     ).filter(
-        db.extract('year', AttendanceRecord.date) == year,
-        db.extract('month', AttendanceRecord.date) == month
-    ).group_by(User.id).having(
-        db.func.sum(db.case((AttendanceRecord.status == 'absent', 1), else_=0)) >= min_absent_days
-    ).order_by(db.desc('absent_days'))
+        AttendanceMonthlyRollup.year == year,
+        AttendanceMonthlyRollup.month == month,
+        AttendanceMonthlyRollup.absent >= min_absent_days
+    ).order_by(AttendanceMonthlyRollup.absent.desc())
     
     results = query.all()
     
@@ -0,0 +1,90 @@
+import logging
+from urllib.parse import urlencode
+from flask import Blueprint, current_app, g, jsonify, request
+from werkzeug.test import EnvironBuilder
+from app.auth import token_required
+from app import db
+
+logger = logging.getLogger(__name__)
+
+batch_bp = Blueprint('batch', __name__)
+
+def _dispatch(app, path, params, headers):
+    """Run one GET sub-request through the normal routing and hooks, reusing the current app context.
+
+    Because the app context is shared, so are ``g`` (and with it the batch's
+    authenticated user) and the SQLAlchemy session.
+    """
+    builder = EnvironBuilder(
+        path=path,
+        method='GET',
+        query_string=urlencode(params, doseq=True),
+        headers=headers,
+        environ_base={'REMOTE_ADDR': request.remote_addr}
+    )
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+
+    with app.request_context(environ):
+        return app.full_dispatch_request()
+
+@batch_bp.route('', methods=['POST'])
+@token_required
+def batch():
+    """Run several GET requests in one round trip, authenticated once"""
+    data = request.get_json(silent=True) or {}
+    sub_requests = data.get('requests')
+
+    if not isinstance(sub_requests, list) or not sub_requests:
+        return jsonify({'error': 'requests must be a non-empty list'}), 400
+
+    max_requests = current_app.config['BATCH_MAX_REQUESTS']
+    if len(sub_requests) > max_requests:
+        return jsonify({'error': f'At most {max_requests} requests per batch'}), 400
+
+    app = current_app._get_current_object()
+    # token_required on the sub-requests picks the user up from here instead of re-verifying
+    g.batch_user = g.user
+
+    responses = []
+    for index, item in enumerate(sub_requests):
+        item = item if isinstance(item, dict) else {}
+        path = item.get('path', '')
+        request_id = item.get('id', index)
+        params = item.get('params') or {}
+
+        if item.get('method', 'GET').upper() != 'GET':
+            responses.append({'id': request_id, 'status': 400, 'body': {'error': 'Only GET requests can be batched'}})
+            continue
+        if not isinstance(path, str) or not path.startswith('/api/') or path.rstrip('/') == request.path.rstrip('/'):
+            responses.append({'id': request_id, 'status': 400, 'body': {'error': 'path must be an /api/ endpoint other than the batch endpoint'}})
+            continue
+        if not isinstance(params, dict):
+            responses.append({'id': request_id, 'status': 400, 'body': {'error': 'params must be an object'}})
+            continue
+
+        headers = {'Accept': 'application/json'}
+        if item.get('if_none_match'):
+            headers['If-None-Match'] = item['if_none_match']
+
+        try:
+            response = _dispatch(app, path, params, headers)
+        except Exception:
+            logger.exception('Batched request to %s failed', path)
+            db.session.rollback()
+            responses.append({'id': request_id, 'status': 500, 'body': {'error': 'Internal server error'}})
+            continue
+
+        entry = {'id': request_id, 'status': response.status_code}
+        if response.headers.get('ETag'):
+            entry['etag'] = response.headers['ETag']
+        if response.is_json:
+            entry['body'] = response.get_json()
+        elif response.status_code != 304:
+            entry['body'] = {'error': f'Unsupported response type: {response.mimetype}'}
+        response.close()
+        responses.append(entry)
+
+    return jsonify({'responses': responses}), 200
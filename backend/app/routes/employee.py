@@ -4,9 +4,21 @@ from app.utils.decorators import require_role, get_current_user
 from app.auth import token_required
 from app.models.leave import LeaveBalance, LeaveRequest, LeaveType
 from app.models.holiday import Holiday
-from app.models.attendance import AttendanceRecord
+from app.models.attendance import AttendanceRecord, AttendanceMonthlyRollup
 from app.models.user import User, Location
 from app.services.leave_service import LeaveService
+from app.services.attendance_rollup_service import AttendanceRollupService
+from app.services.overview_service import OverviewService
+from app.utils.serializers import (
+    LEAVE_REQUEST_EXTRAS, LEAVE_REQUEST_FIELDS,
+    serialize_attendance_records, serialize_holidays, serialize_leave_balances, serialize_leave_requests
+)
+from app.utils.fieldsets import InvalidFields, load_fields, requested_fields
+from app.utils.dates import in_date_window
+from app.utils.pagination import paginate_request, InvalidCursor
+from app.utils.conditional import (
+    conditional_response, leave_balance_version, make_etag, resource_version
+)
 from app import db
 
 employee_bp = Blueprint('employee', __name__)
@@ -19,15 +31,20 @@ def get_leave_balance():
     user = get_current_user()
     year = request.args.get('year', datetime.now().year, type=int)
     
-    balances = LeaveBalance.query.filter_by(
-        user_id=user['user_id'],
-        year=year
-    ).all()
+    etag = make_etag('balance', user['user_id'], year, *leave_balance_version(user['user_id'], year))
     
-    return jsonify({
-        'year': year,
-        'balances': [b.to_dict() for b in balances]
-    }), 200
+    def build():
+        balances = LeaveBalance.query.filter_by(
+            user_id=user['user_id'],
+            year=year
+        ).all()
+        
+        return jsonify({
+            'year': year,
+            'balances': serialize_leave_balances(balances)
+        }), 200
+    
+    return conditional_response(etag, build)
 
 @employee_bp.route('/leave', methods=['POST'])
 @require_role('employee', 'manager', 'admin')
@@ -73,8 +90,11 @@ def get_leave_history():
     status = request.args.get('status')
     leave_type_id = request.args.get('leave_type_id')
     year = request.args.get('year', type=int)
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 20, type=int)
+    
+    try:
+        fields = requested_fields(LEAVE_REQUEST_FIELDS + ('leave_type',))
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
     
     query = LeaveRequest.query.filter_by(user_id=user['user_id'])
     
@@ -83,18 +103,20 @@ def get_leave_history():
     if leave_type_id:
         query = query.filter_by(leave_type_id=leave_type_id)
     if year:
-        query = query.filter(db.extract('year', LeaveRequest.start_date) == year)
+        query = query.filter(in_date_window(LeaveRequest.start_date, year))
     
-    query = query.order_by(LeaveRequest.created_at.desc())
+    keyset = [(LeaveRequest.created_at, 'desc'), (LeaveRequest.id, 'desc')]
+    query = load_fields(query, LeaveRequest, fields, LEAVE_REQUEST_FIELDS, LEAVE_REQUEST_EXTRAS,
+                        required=[c for c, _ in keyset])
     
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    try:
+        items, page_info = paginate_request(query, keyset, default_per_page=20)
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'requests': [lr.to_dict(include_user=False) for lr in pagination.items],
-        'total': pagination.total,
-        'page': page,
-        'per_page': per_page,
-        'pages': pagination.pages
+        'requests': serialize_leave_requests(items, include_user=False, fields=fields),
+        **page_info
     }), 200
 
 @employee_bp.route('/leave/<leave_id>', methods=['GET'])
@@ -138,17 +160,25 @@ def get_holidays():
     if not user_obj:
         return jsonify({'error': 'User not found'}), 404
     
-    # Get holidays for location
-    holidays = Holiday.query.join(Holiday.locations).filter(
-        Location.id == user_obj.location_id,
-        db.extract('year', Holiday.date) == year
-    ).order_by(Holiday.date).all()
+    etag = make_etag(
+        'holidays', user_obj.location_id, year,
+        resource_version('holidays'), resource_version('locations')
+    )
     
-    return jsonify({
-        'year': year,
-        'location': user_obj.location.to_dict() if user_obj.location else None,
-        'holidays': [h.to_dict() for h in holidays]
-    }), 200
+    def build():
+        # Get holidays for location
+        holidays = Holiday.query.join(Holiday.locations).filter(
+            Location.id == user_obj.location_id,
+            in_date_window(Holiday.date, year)
+        ).order_by(Holiday.date).all()
+        
+        return jsonify({
+            'year': year,
+            'location': user_obj.location.to_dict() if user_obj.location else None,
+            'holidays': serialize_holidays(holidays)
+        }), 200
+    
+    return conditional_response(etag, build)
 
 # Attendance endpoints
 @employee_bp.route('/attendance/check-in', methods=['POST'])
@@ -179,6 +209,7 @@ def check_in():
         )
         db.session.add(existing)
     
+    AttendanceRollupService.refresh([(user['user_id'], today)])
     db.session.commit()
     
     return jsonify(existing.to_dict()), 200
@@ -204,6 +235,7 @@ def check_out():
     attendance.check_out_time = datetime.now()
     attendance.calculate_work_hours()
     
+    AttendanceRollupService.refresh([(user['user_id'], today)])
     db.session.commit()
     
     return jsonify(attendance.to_dict()), 200
@@ -219,8 +251,6 @@ def get_attendance_history():
     end_date = request.args.get('end_date')
     month = request.args.get('month', type=int)
     year = request.args.get('year', datetime.now().year, type=int)
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 31, type=int)
     
     query = AttendanceRecord.query.filter_by(user_id=user['user_id'])
     
@@ -233,22 +263,19 @@ def get_attendance_history():
             return jsonify({'error': 'Invalid date format'}), 400
     elif month:
         query = query.filter(
-            db.extract('year', AttendanceRecord.date) == year,
-            db.extract('month', AttendanceRecord.date) == month
+            in_date_window(AttendanceRecord.date, year, month)
         )
     else:
-        query = query.filter(db.extract('year', AttendanceRecord.date) == year)
-    
-    query = query.order_by(AttendanceRecord.date.desc())
+        query = query.filter(in_date_window(AttendanceRecord.date, year))
     
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    try:
+        items, page_info = paginate_request(query, [(AttendanceRecord.date, 'desc'), (AttendanceRecord.id, 'desc')], default_per_page=31)
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'records': [ar.to_dict() for ar in pagination.items],
-        'total': pagination.total,
-        'page': page,
-        'per_page': per_page,
-        'pages': pagination.pages
+        'records': serialize_attendance_records(items),
+        **page_info
     }), 200
 
 @employee_bp.route('/attendance/summary', methods=['GET'])
@@ -259,21 +286,16 @@ def get_attendance_summary():
     month = request.args.get('month', datetime.now().month, type=int)
     year = request.args.get('year', datetime.now().year, type=int)
     
-    records = AttendanceRecord.query.filter(
-        AttendanceRecord.user_id == user['user_id'],
-        db.extract('year', AttendanceRecord.date) == year,
-        db.extract('month', AttendanceRecord.date) == month
-    ).all()
-    
-    summary = {
-        'total_days': len(records),
-        'present': sum(1 for r in records if r.status == 'present'),
-        'absent': sum(1 for r in records if r.status == 'absent'),
-        'half_day': sum(1 for r in records if r.status == 'half_day'),
-        'on_leave': sum(1 for r in records if r.status == 'on_leave'),
-        'total_work_hours': sum(float(r.work_hours or 0) for r in records),
-        'month': month,
-        'year': year
-    }
-    
-    return jsonify(summary), 200
+    rollup = AttendanceMonthlyRollup.query.get((user['user_id'], year, month))
+    
+    return jsonify(OverviewService.month_summary(rollup, year, month)), 200
+
+@employee_bp.route('/overview', methods=['GET'])
+@token_required
+@require_role('employee', 'manager', 'admin')
+def get_overview():
+    """Home screen snapshot: balances, open requests, today's attendance, month counts and next holidays"""
+    user = get_current_user()
+    holiday_limit = min(max(request.args.get('holidays', 5, type=int), 0), 20)
+    
+    return jsonify(OverviewService.employee_overview(user['user_id'], holiday_limit=holiday_limit)), 200
@@ -3,28 +3,48 @@ from datetime import datetime, date
 from app.utils.decorators import require_role, get_current_user
 from app.auth import token_required
 from app.models.leave import LeaveRequest, LeaveBalance
-from app.models.attendance import AttendanceRecord
+from app.models.attendance import AttendanceRecord, AttendanceMonthlyRollup
 from app.models.user import User
 from app.services.leave_service import LeaveService
+from app.services.attendance_rollup_service import AttendanceRollupService
+from app.services.org_service import OrgService, SCOPES
+from app.utils.serializers import (
+    ATTENDANCE_EXTRAS, ATTENDANCE_FIELDS, LEAVE_REQUEST_EXTRAS, LEAVE_REQUEST_FIELDS,
+    attendance_export_columns, leave_request_export_columns,
+    serialize_attendance_records, serialize_leave_balances, serialize_leave_requests, serialize_users
+)
+from app.utils.dates import in_date_window
+from app.utils.pagination import paginate_request, InvalidCursor
+from app.utils.export import requested_export_format, stream_export
+from app.utils.fieldsets import InvalidFields, load_fields, requested_fields
+from app.utils.conditional import conditional_response, leave_balance_version, make_etag
 from app import db
 from sqlalchemy import or_
 
 manager_bp = Blueprint('manager', __name__)
 
+def _team_scope():
+    """``scope`` query arg: 'direct' (default) or 'all' for the whole reporting subtree; None if invalid"""
+    scope = request.args.get('scope', 'direct')
+    return scope if scope in SCOPES else None
+
 @manager_bp.route('/team', methods=['GET'])
 @token_required
 @require_role('manager', 'admin')
 def get_team():
     """Get team members"""
     user = get_current_user()
+    scope = _team_scope()
+    if scope is None:
+        return jsonify({'error': "scope must be 'direct' or 'all'"}), 400
     
-    team_members = User.query.filter_by(
-        manager_id=user['user_id'],
-        is_active=True
-    ).all()
+    team_members = User.query.filter(
+        User.id.in_(OrgService.report_ids(user['user_id'], scope)),
+        User.is_active.is_(True)
+    ).order_by(User.last_name, User.first_name).all()
     
     return jsonify({
-        'team_members': [member.to_dict() for member in team_members]
+        'team_members': serialize_users(team_members)
     }), 200
 
 @manager_bp.route('/leave/pending', methods=['GET'])
@@ -32,20 +52,17 @@ def get_team():
 def get_pending_leaves():
     """Get pending leave requests from team"""
     user = get_current_user()
-    
-    # Get team member IDs
-    team_member_ids = [m.id for m in User.query.filter_by(manager_id=user['user_id']).all()]
-    
-    if not team_member_ids:
-        return jsonify({'requests': []}), 200
+    scope = _team_scope()
+    if scope is None:
+        return jsonify({'error': "scope must be 'direct' or 'all'"}), 400
     
     pending_requests = LeaveRequest.query.filter(
-        LeaveRequest.user_id.in_(team_member_ids),
+        LeaveRequest.user_id.in_(OrgService.report_ids(user['user_id'], scope)),
         LeaveRequest.status == 'pending'
     ).order_by(LeaveRequest.created_at.asc()).all()
     
     return jsonify({
-        'requests': [lr.to_dict(include_user=True) for lr in pending_requests]
+        'requests': serialize_leave_requests(pending_requests)
     }), 200
 
 @manager_bp.route('/leave/history', methods=['GET'])
@@ -53,39 +70,52 @@ def get_pending_leaves():
 def get_team_leave_history():
     """Get all team leave history"""
     user = get_current_user()
-    
-    # Get team member IDs
-    team_member_ids = [m.id for m in User.query.filter_by(manager_id=user['user_id']).all()]
-    
-    if not team_member_ids:
-        return jsonify({'requests': []}), 200
+    scope = _team_scope()
+    if scope is None:
+        return jsonify({'error': "scope must be 'direct' or 'all'"}), 400
     
     # Query parameters
     status = request.args.get('status')
     user_id = request.args.get('user_id')
     year = request.args.get('year', type=int)
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 20, type=int)
     
-    query = LeaveRequest.query.filter(LeaveRequest.user_id.in_(team_member_ids))
+    try:
+        fields = requested_fields(LEAVE_REQUEST_FIELDS + ('leave_type', 'employee'))
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # The team restriction stays in the query, so a user_id outside it just matches nothing
+    query = LeaveRequest.query.filter(LeaveRequest.user_id.in_(OrgService.report_ids(user['user_id'], scope)))
     
     if status:
         query = query.filter_by(status=status)
-    if user_id and user_id in team_member_ids:
+    if user_id:
         query = query.filter_by(user_id=user_id)
     if year:
-        query = query.filter(db.extract('year', LeaveRequest.start_date) == year)
-    
-    query = query.order_by(LeaveRequest.created_at.desc())
+        query = query.filter(in_date_window(LeaveRequest.start_date, year))
+    
+    keyset = [(LeaveRequest.created_at, 'desc'), (LeaveRequest.id, 'desc')]
+    query = load_fields(query, LeaveRequest, fields, LEAVE_REQUEST_FIELDS, LEAVE_REQUEST_EXTRAS,
+                        required=[c for c, _ in keyset])
+    
+    export_format = requested_export_format()
+    if export_format:
+        return stream_export(
+            query.order_by(LeaveRequest.created_at.desc(), LeaveRequest.id.desc()),
+            lambda leave_requests: serialize_leave_requests(leave_requests, fields=fields),
+            export_format,
+            'team-leave-history',
+            leave_request_export_columns(fields=fields)
+        )
     
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    try:
+        items, page_info = paginate_request(query, keyset, default_per_page=20)
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'requests': [lr.to_dict(include_user=True) for lr in pagination.items],
-        'total': pagination.total,
-        'page': page,
-        'per_page': per_page,
-        'pages': pagination.pages
+        'requests': serialize_leave_requests(items, fields=fields),
+        **page_info
     }), 200
 
 @manager_bp.route('/leave/<leave_id>/approve', methods=['PUT'])
@@ -93,14 +123,16 @@ def get_team_leave_history():
 def approve_leave(leave_id):
     """Approve leave request"""
     user = get_current_user()
+    scope = _team_scope()
+    if scope is None:
+        return jsonify({'error': "scope must be 'direct' or 'all'"}), 400
     
     # Verify leave request belongs to team member
     leave_request = LeaveRequest.query.get(leave_id)
     if not leave_request:
         return jsonify({'error': 'Leave request not found'}), 404
     
-    employee = User.query.get(leave_request.user_id)
-    if not employee or employee.manager_id != user['user_id']:
+    if not OrgService.reports_to(leave_request.user_id, user['user_id'], scope):
         return jsonify({'error': 'Unauthorized'}), 403
     
     result = LeaveService.approve_leave(leave_id, user['user_id'])
@@ -120,13 +152,16 @@ def reject_leave(leave_id):
     if not data or 'rejection_reason' not in data:
         return jsonify({'error': 'Rejection reason is required'}), 400
     
+    scope = _team_scope()
+    if scope is None:
+        return jsonify({'error': "scope must be 'direct' or 'all'"}), 400
+    
     # Verify leave request belongs to team member
     leave_request = LeaveRequest.query.get(leave_id)
     if not leave_request:
         return jsonify({'error': 'Leave request not found'}), 404
     
-    employee = User.query.get(leave_request.user_id)
-    if not employee or employee.manager_id != user['user_id']:
+    if not OrgService.reports_to(leave_request.user_id, user['user_id'], scope):
         return jsonify({'error': 'Unauthorized'}), 403
     
     result = LeaveService.reject_leave(leave_id, user['user_id'], data['rejection_reason'])
@@ -136,6 +171,38 @@ def reject_leave(leave_id):
     else:
         return jsonify({'error': result['error']}), 400
 
+@manager_bp.route('/leave/bulk-decision', methods=['POST'])
+@token_required
+@require_role('manager', 'admin')
+def bulk_leave_decision():
+    """Approve or reject several team leave requests at once"""
+    user = get_current_user()
+    data = request.get_json()
+    
+    if not data or not isinstance(data.get('decisions'), list) or not data['decisions']:
+        return jsonify({'error': 'decisions must be a non-empty list'}), 400
+    
+    if not all(isinstance(item, dict) for item in data['decisions']):
+        return jsonify({'error': 'Each decision must be an object with leave_id and decision'}), 400
+    
+    scope = _team_scope()
+    if scope is None:
+        return jsonify({'error': "scope must be 'direct' or 'all'"}), 400
+    
+    results, decided = LeaveService.bulk_decide(user['user_id'], data['decisions'], scope)
+    
+    serialized = {lr['id']: lr for lr in serialize_leave_requests(decided)}
+    for result in results:
+        if result['success']:
+            result['leave_request'] = serialized[result['leave_id']]
+    
+    return jsonify({
+        'processed': len(results),
+        'successful': sum(1 for r in results if r['success']),
+        'failed': sum(1 for r in results if not r['success']),
+        'results': results
+    }), 200
+
 @manager_bp.route('/leave/apply', methods=['POST'])
 @require_role('manager', 'admin')
 def apply_leave_on_behalf():
@@ -148,9 +215,12 @@ def apply_leave_on_behalf():
     if not all(field in data for field in required_fields):
         return jsonify({'error': 'Missing required fields'}), 400
     
+    scope = _team_scope()
+    if scope is None:
+        return jsonify({'error': "scope must be 'direct' or 'all'"}), 400
+    
     # Verify employee is in manager's team
-    employee = User.query.get(data['user_id'])
-    if not employee or employee.manager_id != manager['user_id']:
+    if not OrgService.reports_to(data['user_id'], manager['user_id'], scope):
         return jsonify({'error': 'Employee not in your team'}), 403
     
     try:
@@ -181,24 +251,32 @@ def apply_leave_on_behalf():
 def get_employee_balance(user_id):
     """Get employee's leave balance"""
     manager = get_current_user()
+    scope = _team_scope()
+    if scope is None:
+        return jsonify({'error': "scope must be 'direct' or 'all'"}), 400
     
     # Verify employee is in manager's team
-    employee = User.query.get(user_id)
-    if not employee or employee.manager_id != manager['user_id']:
+    if not OrgService.reports_to(user_id, manager['user_id'], scope):
         return jsonify({'error': 'Employee not in your team'}), 403
+    employee = User.query.get(user_id)
     
     year = request.args.get('year', datetime.now().year, type=int)
     
-    balances = LeaveBalance.query.filter_by(
-        user_id=user_id,
-        year=year
-    ).all()
+    etag = make_etag('balance', user_id, year, employee.updated_at, *leave_balance_version(user_id, year))
     
-    return jsonify({
-        'employee': employee.to_dict(),
-        'year': year,
-        'balances': [b.to_dict() for b in balances]
-    }), 200
+    def build():
+        balances = LeaveBalance.query.filter_by(
+            user_id=user_id,
+            year=year
+        ).all()
+        
+        return jsonify({
+            'employee': employee.to_dict(),
+            'year': year,
+            'balances': serialize_leave_balances(balances)
+        }), 200
+    
+    return conditional_response(etag, build)
 
 # Attendance endpoints for managers
 @manager_bp.route('/team/attendance', methods=['GET'])
@@ -206,22 +284,22 @@ def get_employee_balance(user_id):
 def get_team_attendance():
     """Get team attendance records"""
     manager = get_current_user()
-    
-    # Get team member IDs
-    team_member_ids = [m.id for m in User.query.filter_by(manager_id=manager['user_id']).all()]
-    
-    if not team_member_ids:
-        return jsonify({'records': []}), 200
+    scope = _team_scope()
+    if scope is None:
+        return jsonify({'error': "scope must be 'direct' or 'all'"}), 400
     
     # Query parameters
     date_param = request.args.get('date')
     month = request.args.get('month', type=int)
     year = request.args.get('year', datetime.now().year, type=int)
     user_id = request.args.get('user_id')
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 50, type=int)
     
-    query = AttendanceRecord.query.filter(AttendanceRecord.user_id.in_(team_member_ids))
+    try:
+        fields = requested_fields(ATTENDANCE_FIELDS + ('employee',))
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    
+    query = AttendanceRecord.query.filter(AttendanceRecord.user_id.in_(OrgService.report_ids(manager['user_id'], scope)))
     
     if date_param:
         try:
@@ -231,25 +309,36 @@ def get_team_attendance():
             return jsonify({'error': 'Invalid date format'}), 400
     elif month:
         query = query.filter(
-            db.extract('year', AttendanceRecord.date) == year,
-            db.extract('month', AttendanceRecord.date) == month
+            in_date_window(AttendanceRecord.date, year, month)
         )
     else:
-        query = query.filter(db.extract('year', AttendanceRecord.date) == year)
+        query = query.filter(in_date_window(AttendanceRecord.date, year))
     
-    if user_id and user_id in team_member_ids:
+    if user_id:
         query = query.filter_by(user_id=user_id)
     
-    query = query.order_by(AttendanceRecord.date.desc(), AttendanceRecord.user_id)
+    keyset = [(AttendanceRecord.date, 'desc'), (AttendanceRecord.user_id, 'asc')]
+    query = load_fields(query, AttendanceRecord, fields, ATTENDANCE_FIELDS, ATTENDANCE_EXTRAS,
+                        required=[c for c, _ in keyset])
+    
+    export_format = requested_export_format()
+    if export_format:
+        return stream_export(
+            query.order_by(AttendanceRecord.date.desc(), AttendanceRecord.user_id),
+            lambda records: serialize_attendance_records(records, include_user=True, fields=fields),
+            export_format,
+            'team-attendance',
+            attendance_export_columns(include_user=True, fields=fields)
+        )
     
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    try:
+        items, page_info = paginate_request(query, keyset, default_per_page=50)
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'records': [ar.to_dict(include_user=True) for ar in pagination.items],
-        'total': pagination.total,
-        'page': page,
-        'per_page': per_page,
-        'pages': pagination.pages
+        'records': serialize_attendance_records(items, include_user=True, fields=fields),
+        **page_info
     }), 200
 
 @manager_bp.route('/team/attendance/summary', methods=['GET'])
@@ -260,29 +349,47 @@ def get_team_attendance_summary():
     month = request.args.get('month', datetime.now().month, type=int)
     year = request.args.get('year', datetime.now().year, type=int)
     
-    # Get team members
-    team_members = User.query.filter_by(manager_id=manager['user_id']).all()
+    scope = _team_scope()
+    if scope is None:
+        return jsonify({'error': "scope must be 'direct' or 'all'"}), 400
+    
+    # One row per team member from the monthly rollup; the outer join keeps
+    # members without any records in the summary
+    query = db.session.query(
+        User.id,
+        User.first_name,
+        User.last_name,
+        User.email,
+        AttendanceMonthlyRollup.total_days,
+        AttendanceMonthlyRollup.present,
+        AttendanceMonthlyRollup.absent,
+        AttendanceMonthlyRollup.half_day,
+        AttendanceMonthlyRollup.on_leave,
+        AttendanceMonthlyRollup.total_work_hours
+    ).outerjoin(
+        AttendanceMonthlyRollup, db.and_(
+            User.id == AttendanceMonthlyRollup.user_id,
+            AttendanceMonthlyRollup.year == year,
+            AttendanceMonthlyRollup.month == month
+        )
+    ).filter(
+        User.id.in_(OrgService.report_ids(manager['user_id'], scope))
+    ).order_by(User.last_name, User.first_name)
     
     summary = []
-    for member in team_members:
-        records = AttendanceRecord.query.filter(
-            AttendanceRecord.user_id == member.id,
-            db.extract('year', AttendanceRecord.date) == year,
-            db.extract('month', AttendanceRecord.date) == month
-        ).all()
-        
+    for r in query.all():
         summary.append({
             'employee': {
-                'id': member.id,
-                'name': f"{member.first_name} {member.last_name}",
-                'email': member.email
+                'id': r.id,
+                'name': f"{r.first_name} {r.last_name}",
+                'email': r.email
             },
-            'total_days': len(records),
-            'present': sum(1 for r in records if r.status == 'present'),
-            'absent': sum(1 for r in records if r.status == 'absent'),
-            'half_day': sum(1 for r in records if r.status == 'half_day'),
-            'on_leave': sum(1 for r in records if r.status == 'on_leave'),
-            'total_work_hours': sum(float(r.work_hours or 0) for r in records)
+            'total_days': r.total_days or 0,
+            'present': r.present or 0,
+            'absent': r.absent or 0,
+            'half_day': r.half_day or 0,
+            'on_leave': r.on_leave or 0,
+            'total_work_hours': float(r.total_work_hours or 0)
         })
     
     return jsonify({
@@ -302,9 +409,12 @@ def mark_attendance():
     if not all(field in data for field in required_fields):
         return jsonify({'error': 'Missing required fields'}), 400
     
+    scope = _team_scope()
+    if scope is None:
+        return jsonify({'error': "scope must be 'direct' or 'all'"}), 400
+    
     # Verify employee is in manager's team
-    employee = User.query.get(data['user_id'])
-    if not employee or employee.manager_id != manager['user_id']:
+    if not OrgService.reports_to(data['user_id'], manager['user_id'], scope):
         return jsonify({'error': 'Employee not in your team'}), 403
     
     try:
@@ -330,6 +440,7 @@ def mark_attendance():
         )
         db.session.add(existing)
     
+    AttendanceRollupService.refresh([(data['user_id'], attendance_date)])
     db.session.commit()
     
     return jsonify(existing.to_dict(include_user=True)), 200
@@ -0,0 +1,108 @@
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from app import db
+from app.models.attendance import AttendanceRecord, AttendanceMonthlyRollup
+from app.utils.dates import in_date_window
+
+ROLLUP_COLUMNS = [
+    'user_id', 'year', 'month', 'total_days', 'present', 'absent',
+    'half_day', 'on_leave', 'total_work_hours', 'updated_at'
+]
+
+class AttendanceRollupService:
+
+    @staticmethod
+    def _aggregate(*filters):
+        """SELECT of rollup rows aggregated from attendance_records"""
+        year = db.cast(db.extract('year', AttendanceRecord.date), db.Integer)
+        month = db.cast(db.extract('month', AttendanceRecord.date), db.Integer)
+
+        return db.select(
+            AttendanceRecord.user_id,
+            year,
+            month,
+            db.func.count(AttendanceRecord.id),
+            db.func.sum(db.case((AttendanceRecord.status == 'present', 1), else_=0)),
+            db.func.sum(db.case((AttendanceRecord.status == 'absent', 1), else_=0)),
+            db.func.sum(db.case((AttendanceRecord.status == 'half_day', 1), else_=0)),
+            db.func.sum(db.case((AttendanceRecord.status == 'on_leave', 1), else_=0)),
+            db.func.coalesce(db.func.sum(AttendanceRecord.work_hours), 0),
+            db.literal(datetime.utcnow())
+        ).where(*filters).group_by(AttendanceRecord.user_id, year, month)
+
+    @staticmethod
+    def _upsert(select_statement):
+        statement = pg_insert(AttendanceMonthlyRollup.__table__).from_select(ROLLUP_COLUMNS, select_statement)
+        statement = statement.on_conflict_do_update(
+            index_elements=['user_id', 'year', 'month'],
+            set_={column: statement.excluded[column] for column in ROLLUP_COLUMNS[3:]}
+        )
+        return db.session.execute(statement).rowcount
+
+    @staticmethod
+    def _lock_user_months(users_by_month):
+        """Take a transaction-scoped advisory lock per user-month, in one statement.
+
+        Keys are locked in sorted order so overlapping refreshes can't deadlock.
+        """
+        keys = sorted(
+            f'attendance_rollup:{user_id}:{year}:{month}'
+            for (year, month), user_ids in users_by_month.items()
+            for user_id in user_ids
+        )
+        ordered = db.select(
+            db.func.unnest(db.bindparam('keys', keys, type_=ARRAY(db.Text))).label('key')
+        ).order_by('key').subquery()
+        db.session.execute(db.select(db.func.pg_advisory_xact_lock(db.func.hashtext(ordered.c.key)))).all()
+
+    @staticmethod
+    def refresh(user_dates):
+        """Recompute the rollup rows touched by ``(user_id, date)`` pairs.
+
+        Runs in the caller's transaction, so the rollup commits together with
+        the attendance change. Each affected user-month is re-aggregated from
+        its own (at most 31) records, grouped into one statement per month,
+        under an advisory lock so concurrent refreshes of the same user-month
+        apply one after the other and the later one sees both changes. Rows
+        for user-months left without records are deleted.
+        """
+        users_by_month = {}
+        for user_id, record_date in user_dates:
+            users_by_month.setdefault((record_date.year, record_date.month), set()).add(user_id)
+
+        if not users_by_month:
+            return
+
+        AttendanceRollupService._lock_user_months(users_by_month)
+
+        # Make pending ORM changes visible to the INSERT ... SELECT
+        db.session.flush()
+
+        for (year, month), user_ids in users_by_month.items():
+            window = in_date_window(AttendanceRecord.date, year, month)
+            AttendanceRollupService._upsert(AttendanceRollupService._aggregate(
+                AttendanceRecord.user_id.in_(user_ids),
+                window
+            ))
+            db.session.query(AttendanceMonthlyRollup).filter(
+                AttendanceMonthlyRollup.user_id.in_(user_ids),
+                AttendanceMonthlyRollup.year == year,
+                AttendanceMonthlyRollup.month == month,
+                ~db.exists().where(AttendanceRecord.user_id == AttendanceMonthlyRollup.user_id, window)
+            ).delete(synchronize_session=False)
+
+    @staticmethod
+    def rebuild(year=None, month=None):
+        """Backfill the rollup from raw records for everything, a year or a month"""
+        filters = []
+        rollup_filters = []
+        if year is not None:
+            filters.append(in_date_window(AttendanceRecord.date, year, month))
+            rollup_filters.append(AttendanceMonthlyRollup.year == year)
+            if month is not None:
+                rollup_filters.append(AttendanceMonthlyRollup.month == month)
+
+        db.session.query(AttendanceMonthlyRollup).filter(*rollup_filters).delete(synchronize_session=False)
+        count = AttendanceRollupService._upsert(AttendanceRollupService._aggregate(*filters))
+        db.session.commit()
+        return count
@@ -0,0 +1,73 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date
+from flask import current_app
+from app import db
+from app.models.holiday import Holiday, location_holidays
+
+class HolidayCalendar:
+    """In-memory per-location holiday calendar, indexed by year.
+
+    Each entry is the sorted list of a location's holidays in one year that
+    fall on a weekday (weekend holidays never change a leave count). Entries
+    are dropped whenever holidays or their location assignments change in
+    this process, and expire after HOLIDAY_CACHE_TTL_SECONDS so changes made
+    through other worker processes are picked up too.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def weekday_holidays(self, location_id, year):
+        """Sorted weekday holiday dates for a location and year"""
+        key = (location_id, year)
+        now = time.monotonic()
+        ttl = current_app.config['HOLIDAY_CACHE_TTL_SECONDS']
+
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
+
+        rows = db.session.query(Holiday.date).join(
+            location_holidays, location_holidays.c.holiday_id == Holiday.id
+        ).filter(
+            location_holidays.c.location_id == location_id,
+            Holiday.date >= date(year, 1, 1),
+            Holiday.date < date(year + 1, 1, 1)
+        ).distinct().all()
+        dates = sorted(d for (d,) in rows if d.weekday() < 5)
+
+        with self._lock:
+            self._entries[key] = (now, dates)
+        return dates
+
+    def count_holidays(self, location_id, start_date, end_date):
+        """Number of weekday holidays between start_date and end_date inclusive"""
+        count = 0
+        for year in range(start_date.year, end_date.year + 1):
+            dates = self.weekday_holidays(location_id, year)
+            count += bisect_right(dates, end_date) - bisect_left(dates, start_date)
+        return count
+
+    def invalidate(self, location_id=None):
+        """Drop cached years for one location, or for every location"""
+        with self._lock:
+            if location_id is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == location_id]:
+                    del self._entries[key]
+
+holiday_calendar = HolidayCalendar()
+
+def count_weekdays(start_date, end_date):
+    """Number of Monday-Friday dates between start_date and end_date inclusive"""
+    days = (end_date - start_date).days + 1
+    if days <= 0:
+        return 0
+
+    full_weeks, remainder = divmod(days, 7)
+    first_weekday = start_date.weekday()
+    return full_weeks * 5 + sum(1 for i in range(remainder) if (first_weekday + i) % 7 < 5)
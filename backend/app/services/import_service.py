@@ -0,0 +1,224 @@
+import uuid
+from datetime import datetime
+import pandas as pd
+from flask import current_app
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app import db
+from app.models.user import User, Location
+from app.models.attendance import AttendanceRecord
+from app.services.attendance_rollup_service import AttendanceRollupService
+
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+VALID_ROLES = ['employee', 'manager', 'admin']
+VALID_ATTENDANCE_STATUSES = ['present', 'absent', 'half_day', 'on_leave']
+
+class ImportService:
+
+    @staticmethod
+    def read_frame(file, filename):
+        """Read an uploaded CSV/Excel file into a DataFrame"""
+        if filename.endswith('.csv'):
+            return pd.read_csv(file)
+        return pd.read_excel(file)
+
+    @staticmethod
+    def _text_column(df, column):
+        """Column as stripped strings with missing cells as ''"""
+        if column not in df.columns:
+            return pd.Series('', index=df.index)
+        return df[column].where(df[column].notna(), '').astype(str).str.strip()
+
+    @staticmethod
+    def _existing_ids(column, values):
+        """Subset of ``values`` present in ``column``, with one IN query"""
+        values = [v for v in set(values) if v]
+        if not values:
+            return set()
+        return {row[0] for row in db.session.query(column).filter(column.in_(values)).all()}
+
+    @staticmethod
+    def import_users(df, chunk_size=None, progress=None):
+        """Validate a users frame as a whole and bulk insert the valid rows.
+
+        Returns the same ``{'success': [...], 'errors': [...]}`` report the
+        row-by-row import produced, with one error per rejected row.
+        ``progress`` is called with the number of rows handled so far.
+        """
+        if chunk_size is None:
+            chunk_size = current_app.config['BULK_IMPORT_CHUNK_SIZE']
+
+        df = df.reset_index(drop=True)
+        rows = pd.DataFrame({
+            column: ImportService._text_column(df, column)
+            for column in ['email', 'first_name', 'last_name', 'role', 'location_id', 'manager_id']
+        })
+        row_numbers = df.index + 2
+
+        existing_emails = ImportService._existing_ids(User.email, rows['email'])
+        known_locations = ImportService._existing_ids(Location.id, rows['location_id'])
+        known_managers = ImportService._existing_ids(User.id, rows['manager_id'])
+
+        # Checks in priority order; each row reports the first one it fails
+        checks = [
+            ((rows[['email', 'first_name', 'last_name', 'role', 'location_id']] == '').any(axis=1),
+             'Missing required fields'),
+            (~rows['email'].str.match(EMAIL_PATTERN), 'Invalid email format'),
+            (~rows['role'].isin(VALID_ROLES), f'Invalid role. Allowed: {VALID_ROLES}'),
+            (rows['email'].duplicated(keep='first'), 'Duplicate email in file'),
+            (rows['email'].isin(existing_emails), 'User already exists'),
+            (~rows['location_id'].isin(known_locations), 'Location not found'),
+            ((rows['manager_id'] != '') & ~rows['manager_id'].isin(known_managers), 'Manager not found'),
+        ]
+
+        error_messages = pd.Series(None, index=rows.index, dtype=object)
+        for failed, message in checks:
+            error_messages = error_messages.mask(failed & error_messages.isna(), message)
+
+        results = {'success': [], 'errors': []}
+        failed_rows = error_messages.notna()
+        for idx in rows.index[failed_rows]:
+            results['errors'].append({
+                'row': int(row_numbers[idx]),
+                'email': rows.at[idx, 'email'] or 'N/A',
+                'error': error_messages[idx]
+            })
+
+        valid = rows[~failed_rows]
+        now = datetime.utcnow()
+        records = [
+            {
+                'id': str(uuid.uuid4()),
+                'email': r.email,
+                'first_name': r.first_name,
+                'last_name': r.last_name,
+                'role': r.role,
+                'location_id': r.location_id,
+                'manager_id': r.manager_id or None,
+                'is_active': True,
+                'created_at': now,
+                'updated_at': now
+            }
+            for r in valid.itertuples(index=False)
+        ]
+        valid_row_numbers = [int(row_numbers[idx]) for idx in valid.index]
+        rejected = len(results['errors'])
+        if progress:
+            progress(rejected)
+
+        for start in range(0, len(records), chunk_size):
+            chunk = records[start:start + chunk_size]
+            try:
+                db.session.execute(insert(User), chunk)
+                db.session.commit()
+                results['success'].extend(r['email'] for r in chunk)
+            except Exception as e:
+                db.session.rollback()
+                for record, row in zip(chunk, valid_row_numbers[start:start + chunk_size]):
+                    results['errors'].append({
+                        'row': row,
+                        'email': record['email'],
+                        'error': str(e)
+                    })
+            if progress:
+                progress(rejected + start + len(chunk))
+
+        results['errors'].sort(key=lambda error: error['row'])
+        return results
+
+    @staticmethod
+    def import_attendance(df, chunk_size=None, progress=None):
+        """Upsert an attendance frame in chunks of ``chunk_size`` rows.
+
+        Each chunk is validated as a whole, written with a single
+        INSERT ... ON CONFLICT (user_id, date) DO UPDATE and committed on its
+        own, so a failing chunk is reported row by row without affecting the
+        chunks before or after it. ``progress`` is called after every chunk
+        with the number of rows handled so far.
+        """
+        if chunk_size is None:
+            chunk_size = current_app.config['BULK_IMPORT_CHUNK_SIZE']
+
+        df = df.reset_index(drop=True)
+        results = {'success': [], 'errors': []}
+
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start + chunk_size]
+            ImportService._upsert_attendance_chunk(chunk, results)
+            if progress:
+                progress(start + len(chunk))
+
+        results['errors'].sort(key=lambda error: error['row'])
+        return results
+
+    @staticmethod
+    def _upsert_attendance_chunk(chunk, results):
+        rows = pd.DataFrame({
+            'user_id': ImportService._text_column(chunk, 'user_id'),
+            'status': ImportService._text_column(chunk, 'status'),
+            'date': pd.to_datetime(chunk['date'], errors='coerce').dt.date,
+            'notes': chunk['notes'].astype(object).where(chunk['notes'].notna(), None)
+                     if 'notes' in chunk.columns else pd.Series(None, index=chunk.index, dtype=object)
+        })
+        row_numbers = chunk.index + 2
+
+        known_users = ImportService._existing_ids(User.id, rows['user_id'])
+
+        checks = [
+            (rows['user_id'] == '', 'Missing user_id'),
+            (rows['date'].isna(), 'Invalid date'),
+            (~rows['status'].isin(VALID_ATTENDANCE_STATUSES), f'Invalid status. Allowed: {VALID_ATTENDANCE_STATUSES}'),
+            (~rows['user_id'].isin(known_users), 'User not found'),
+        ]
+
+        error_messages = pd.Series(None, index=rows.index, dtype=object)
+        for failed, message in checks:
+            error_messages = error_messages.mask(failed & error_messages.isna(), message)
+
+        failed_rows = error_messages.notna()
+        for idx in rows.index[failed_rows]:
+            results['errors'].append({'row': int(row_numbers[idx]), 'error': error_messages[idx]})
+
+        valid = rows[~failed_rows]
+        if valid.empty:
+            return
+
+        # Later rows for the same user and day win, as they did when rows were applied one at a time;
+        # ON CONFLICT can't touch the same row twice in one statement
+        deduped = valid.drop_duplicates(subset=['user_id', 'date'], keep='last')
+
+        now = datetime.utcnow()
+        records = [
+            {
+                'id': str(uuid.uuid4()),
+                'user_id': r.user_id,
+                'date': r.date,
+                'status': r.status,
+                'notes': r.notes,
+                'created_at': now,
+                'updated_at': now
+            }
+            for r in deduped.itertuples(index=False)
+        ]
+
+        statement = pg_insert(AttendanceRecord.__table__).values(records)
+        statement = statement.on_conflict_do_update(
+            constraint='_user_date_uc',
+            set_={
+                'status': statement.excluded.status,
+                'notes': statement.excluded.notes,
+                'updated_at': statement.excluded.updated_at
+            }
+        )
+
+        try:
+            db.session.execute(statement)
+            AttendanceRollupService.refresh((r.user_id, r.date) for r in deduped.itertuples(index=False))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            for idx in valid.index:
+                results['errors'].append({'row': int(row_numbers[idx]), 'error': str(e)})
+            return
+
+        results['success'].extend(f"{r.user_id} - {r.date}" for r in valid.itertuples(index=False))
@@ -0,0 +1,183 @@
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from werkzeug.utils import secure_filename
+from app import db
+from app.models.job import ImportJob
+from app.services.import_service import ImportService
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = {
+    'users': ['email', 'first_name', 'last_name', 'role', 'location_id'],
+    'attendance': ['user_id', 'date', 'status']
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor(max_workers):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='import-job')
+        return _executor
+
+class JobService:
+
+    @staticmethod
+    def submit(kind, file, created_by_id=None):
+        """Spool an uploaded file to disk, record a queued job and hand it to the worker pool"""
+        app = current_app._get_current_object()
+        spool_dir = app.config['UPLOAD_SPOOL_DIR']
+        os.makedirs(spool_dir, exist_ok=True)
+
+        job_id = str(uuid.uuid4())
+        filename = secure_filename(file.filename) or 'upload'
+        file_path = os.path.join(spool_dir, f"{job_id}_{filename}")
+        file.save(file_path)
+
+        job = ImportJob(
+            id=job_id,
+            kind=kind,
+            filename=filename,
+            file_path=file_path,
+            created_by_id=created_by_id
+        )
+        db.session.add(job)
+        db.session.commit()
+
+        JobService.enqueue(app, job.id)
+        return job
+
+    @staticmethod
+    def enqueue(app, job_id):
+        _get_executor(app.config['BULK_IMPORT_WORKERS']).submit(JobService._run_in_context, app, job_id)
+
+    @staticmethod
+    def _run_in_context(app, job_id):
+        with app.app_context():
+            try:
+                JobService.run(job_id)
+            except Exception:
+                logger.exception('Import job %s crashed', job_id)
+            finally:
+                db.session.remove()
+
+    @staticmethod
+    def _claim(job_id):
+        """Move a job from queued to running; False if another worker got it first"""
+        claimed = ImportJob.query.filter_by(id=job_id, status='queued').update(
+            {'status': 'running', 'started_at': datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.session.commit()
+        return claimed == 1
+
+    @staticmethod
+    def _update(job_id, **values):
+        # Every update bumps updated_at, which doubles as the running job's heartbeat
+        ImportJob.query.filter_by(id=job_id).update(values, synchronize_session=False)
+        db.session.commit()
+
+    @staticmethod
+    def run(job_id):
+        """Process a queued job to completion, recording progress as it goes"""
+        if not JobService._claim(job_id):
+            return
+
+        job = ImportJob.query.get(job_id)
+        file_path = job.file_path
+        try:
+            df = ImportService.read_frame(file_path, job.filename)
+
+            required_columns = REQUIRED_COLUMNS[job.kind]
+            if not all(col in df.columns for col in required_columns):
+                raise ValueError(f'Missing required columns. Required: {required_columns}')
+
+            JobService._update(job_id, total_rows=len(df))
+
+            def progress(processed_rows):
+                JobService._update(job_id, processed_rows=processed_rows)
+
+            if job.kind == 'users':
+                results = ImportService.import_users(df, progress=progress)
+            else:
+                results = ImportService.import_attendance(df, progress=progress)
+
+            JobService._update(
+                job_id,
+                status='completed',
+                processed_rows=len(df),
+                successful=len(results['success']),
+                failed=len(results['errors']),
+                errors=results['errors'],
+                finished_at=datetime.utcnow()
+            )
+        except Exception as e:
+            db.session.rollback()
+            JobService._update(
+                job_id,
+                status='failed',
+                error_message=f'Failed to process file: {str(e)}',
+                finished_at=datetime.utcnow()
+            )
+        finally:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    @staticmethod
+    def recover_stale(stale_after=None):
+        """Requeue running jobs whose worker stopped sending progress.
+
+        A job counts as stale once its heartbeat (``updated_at``) is older than
+        ``stale_after`` seconds (IMPORT_JOB_STALE_SECONDS by default). It is
+        requeued from the start while its spooled upload still exists, and
+        marked failed otherwise. Returns ``(requeued, failed)`` counts.
+        """
+        if stale_after is None:
+            stale_after = current_app.config['IMPORT_JOB_STALE_SECONDS']
+        cutoff = datetime.utcnow() - timedelta(seconds=stale_after)
+
+        stale = db.session.query(ImportJob.id, ImportJob.file_path, ImportJob.updated_at).filter(
+            ImportJob.status == 'running',
+            ImportJob.updated_at < cutoff
+        ).all()
+
+        requeued = failed = 0
+        for job_id, file_path, heartbeat in stale:
+            if os.path.exists(file_path):
+                values = {'status': 'queued', 'started_at': None, 'total_rows': None, 'processed_rows': 0}
+            else:
+                values = {
+                    'status': 'failed',
+                    'error_message': 'Import stopped before finishing and the uploaded file is gone',
+                    'finished_at': datetime.utcnow()
+                }
+            # Only if the heartbeat hasn't moved since, so a worker that is still alive keeps its job
+            recovered = ImportJob.query.filter_by(id=job_id, status='running', updated_at=heartbeat).update(
+                values, synchronize_session=False
+            )
+            if not recovered:
+                continue
+            if values['status'] == 'queued':
+                logger.warning('Import job %s went stale; requeued', job_id)
+                requeued += 1
+            else:
+                logger.warning('Import job %s went stale and its upload is gone; marked failed', job_id)
+                failed += 1
+        db.session.commit()
+        return requeued, failed
+
+    @staticmethod
+    def resume_queued():
+        """Run jobs left queued (or requeued as stale) by a restarted process; returns how many were picked up"""
+        JobService.recover_stale()
+        job_ids = [job_id for (job_id,) in db.session.query(ImportJob.id).filter_by(status='queued').all()]
+        for job_id in job_ids:
+            JobService.run(job_id)
+        return len(job_ids)
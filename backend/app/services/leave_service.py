@@ -1,7 +1,10 @@
-from datetime import datetime, timedelta, date
+from datetime import datetime, date
+from decimal import Decimal
+from sqlalchemy import update, bindparam
 from app import db
 from app.models.leave import LeaveRequest, LeaveBalance
-from app.models.holiday import Holiday
+from app.services.holiday_calendar import holiday_calendar, count_weekdays
+from app.services.org_service import OrgService
 from app.models.user import User
 
 class LeaveService:
@@ -9,44 +12,16 @@ class LeaveService:
     @staticmethod
     def calculate_leave_days(start_date, end_date, user_id):
         """Calculate working days excluding weekends and holidays"""
-        user = User.query.get(user_id)
-        if not user:
+        location_id = db.session.query(User.location_id).filter(User.id == user_id).scalar()
+        if not location_id:
             return 0
         
-        # Get location holidays
-        holidays = LeaveService._get_location_holidays(user.location_id, start_date, end_date)
-        holiday_dates = [h.date for h in holidays]
-        
-        total_days = 0
-        current_date = start_date
-        
-        while current_date <= end_date:
-            # Skip weekends (Saturday=5, Sunday=6)
-            if current_date.weekday() < 5:
-                # Skip holidays
-                if current_date not in holiday_dates:
-                    total_days += 1
-            current_date += timedelta(days=1)
+        # Weekdays in the range minus the location's weekday holidays, both without a day-by-day walk
+        working_days = count_weekdays(start_date, end_date)
+        if working_days == 0:
+            return 0
         
-        return total_days
-    
-    @staticmethod
-    def _get_location_holidays(location_id, start_date, end_date):
-        """Get holidays for a location within date range"""
-        from app.models.user import Location
-        
-        location = Location.query.get(location_id)
-        if not location:
-            return []
-        
-        # Get holidays assigned to this location within the date range
-        holidays = Holiday.query.join(Holiday.locations).filter(
-            Location.id == location_id,
-            Holiday.date >= start_date,
-            Holiday.date <= end_date
-        ).all()
-        
-        return holidays
+        return working_days - holiday_calendar.count_holidays(location_id, start_date, end_date)
     
     @staticmethod
     def validate_leave_balance(user_id, leave_type_id, days_requested, year=None):
@@ -68,6 +43,42 @@ class LeaveService:
         
         return True, "Balance available"
     
+    @staticmethod
+    def _balance_filter(user_id, leave_type_id, year):
+        return db.and_(
+            LeaveBalance.user_id == user_id,
+            LeaveBalance.leave_type_id == leave_type_id,
+            LeaveBalance.year == year
+        )
+    
+    @staticmethod
+    def _adjust_balance(user_id, leave_type_id, year, pending=Decimal('0'), used=Decimal('0')):
+        """Apply pending/used deltas as one in-database increment, so concurrent updates can't be lost"""
+        return db.session.execute(
+            update(LeaveBalance)
+            .where(LeaveService._balance_filter(user_id, leave_type_id, year))
+            .values(pending=LeaveBalance.pending + pending, used=LeaveBalance.used + used)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    
+    @staticmethod
+    def _reserve_balance(user_id, leave_type_id, year, days):
+        """Atomically add ``days`` to pending only if that much is still available"""
+        return db.session.execute(
+            update(LeaveBalance)
+            .where(
+                LeaveService._balance_filter(user_id, leave_type_id, year),
+                LeaveBalance.total_allocated - LeaveBalance.used - LeaveBalance.pending >= days
+            )
+            .values(pending=LeaveBalance.pending + days)
+            .execution_options(synchronize_session=False)
+        ).rowcount == 1
+    
+    @staticmethod
+    def _lock_leave_request(leave_request_id):
+        """Load a leave request with a row lock so its status can't change under us"""
+        return LeaveRequest.query.filter_by(id=leave_request_id).with_for_update().first()
+    
     @staticmethod
     def apply_leave(user_id, leave_type_id, start_date, end_date, reason, applied_by_id=None):
         """Apply for leave"""
@@ -81,12 +92,12 @@ class LeaveService:
         if total_days == 0:
             return {'success': False, 'error': 'No working days in the selected date range'}
         
-        # Validate balance
+        # Reserve the days in pending; the availability check and the increment are one statement
         year = start_date.year
-        is_valid, message = LeaveService.validate_leave_balance(user_id, leave_type_id, total_days, year)
-        
-        if not is_valid:
-            return {'success': False, 'error': message}
+        if not LeaveService._reserve_balance(user_id, leave_type_id, year, Decimal(total_days)):
+            db.session.rollback()
+            is_valid, message = LeaveService.validate_leave_balance(user_id, leave_type_id, total_days, year)
+            return {'success': False, 'error': message if not is_valid else 'Insufficient balance'}
         
         # Create leave request
         leave_request = LeaveRequest(
@@ -101,16 +112,6 @@ class LeaveService:
         )
         
         db.session.add(leave_request)
-        
-        # Update pending balance
-        balance = LeaveBalance.query.filter_by(
-            user_id=user_id,
-            leave_type_id=leave_type_id,
-            year=year
-        ).first()
-        
-        balance.pending = float(balance.pending) + total_days
-        
         db.session.commit()
         
         return {'success': True, 'leave_request': leave_request.to_dict()}
@@ -118,12 +119,14 @@ class LeaveService:
     @staticmethod
     def approve_leave(leave_request_id, approved_by_id):
         """Approve leave request"""
-        leave_request = LeaveRequest.query.get(leave_request_id)
+        leave_request = LeaveService._lock_leave_request(leave_request_id)
         
         if not leave_request:
+            db.session.rollback()
             return {'success': False, 'error': 'Leave request not found'}
         
         if leave_request.status != 'pending':
+            db.session.rollback()
             return {'success': False, 'error': f'Cannot approve leave with status: {leave_request.status}'}
         
         # Update leave request
@@ -131,16 +134,14 @@ class LeaveService:
         leave_request.approved_by_id = approved_by_id
         
         # Update balance: move from pending to used
-        year = leave_request.start_date.year
-        balance = LeaveBalance.query.filter_by(
-            user_id=leave_request.user_id,
-            leave_type_id=leave_request.leave_type_id,
-            year=year
-        ).first()
-        
-        if balance:
-            balance.pending = float(balance.pending) - float(leave_request.total_days)
-            balance.used = float(balance.used) + float(leave_request.total_days)
+        total_days = Decimal(leave_request.total_days)
+        LeaveService._adjust_balance(
+            leave_request.user_id,
+            leave_request.leave_type_id,
+            leave_request.start_date.year,
+            pending=-total_days,
+            used=total_days
+        )
         
         db.session.commit()
         
@@ -149,12 +150,14 @@ class LeaveService:
     @staticmethod
     def reject_leave(leave_request_id, approved_by_id, rejection_reason):
         """Reject leave request"""
-        leave_request = LeaveRequest.query.get(leave_request_id)
+        leave_request = LeaveService._lock_leave_request(leave_request_id)
         
         if not leave_request:
+            db.session.rollback()
             return {'success': False, 'error': 'Leave request not found'}
         
         if leave_request.status != 'pending':
+            db.session.rollback()
             return {'success': False, 'error': f'Cannot reject leave with status: {leave_request.status}'}
         
         # Update leave request
@@ -163,15 +166,12 @@ class LeaveService:
         leave_request.rejection_reason = rejection_reason
         
         # Update balance: remove from pending
-        year = leave_request.start_date.year
-        balance = LeaveBalance.query.filter_by(
-            user_id=leave_request.user_id,
-            leave_type_id=leave_request.leave_type_id,
-            year=year
-        ).first()
-        
-        if balance:
-            balance.pending = float(balance.pending) - float(leave_request.total_days)
+        LeaveService._adjust_balance(
+            leave_request.user_id,
+            leave_request.leave_type_id,
+            leave_request.start_date.year,
+            pending=-Decimal(leave_request.total_days)
+        )
         
         db.session.commit()
         
@@ -180,31 +180,138 @@ class LeaveService:
     @staticmethod
     def cancel_leave(leave_request_id, user_id):
         """Cancel leave request (only if pending)"""
-        leave_request = LeaveRequest.query.get(leave_request_id)
+        leave_request = LeaveService._lock_leave_request(leave_request_id)
         
         if not leave_request:
+            db.session.rollback()
             return {'success': False, 'error': 'Leave request not found'}
         
         if leave_request.user_id != user_id:
+            db.session.rollback()
             return {'success': False, 'error': 'Unauthorized'}
         
         if leave_request.status != 'pending':
+            db.session.rollback()
             return {'success': False, 'error': f'Cannot cancel leave with status: {leave_request.status}'}
         
         # Update leave request
         leave_request.status = 'cancelled'
         
         # Update balance: remove from pending
-        year = leave_request.start_date.year
-        balance = LeaveBalance.query.filter_by(
-            user_id=leave_request.user_id,
-            leave_type_id=leave_request.leave_type_id,
-            year=year
-        ).first()
-        
-        if balance:
-            balance.pending = float(balance.pending) - float(leave_request.total_days)
+        LeaveService._adjust_balance(
+            leave_request.user_id,
+            leave_request.leave_type_id,
+            leave_request.start_date.year,
+            pending=-Decimal(leave_request.total_days)
+        )
         
         db.session.commit()
         
         return {'success': True, 'leave_request': leave_request.to_dict()}
+    
+    @staticmethod
+    def bulk_decide(manager_id, decisions, scope='direct'):
+        """Approve or reject many team leave requests in one transaction.
+        
+        ``decisions`` is a list of ``{'leave_id', 'decision', 'rejection_reason'}``
+        dicts, limited to requests of ``manager_id``'s team (``scope`` as in
+        ``OrgService.report_ids``). Ownership is checked and the requests are locked with a single
+        query; the status changes and the balance deltas are each applied with
+        one batched UPDATE, and the decided requests are reloaded with one
+        query, so the statement count doesn't grow with the batch size.
+        Returns one result per decision, in input order, and the decided requests.
+        """
+        leave_ids = [d.get('leave_id') for d in decisions]
+        
+        # Lock the owned requests in id order so concurrent bulk decisions and
+        # reconciliation can't deadlock
+        owned = {
+            lr.id: lr for lr in LeaveRequest.query.filter(
+                LeaveRequest.id.in_([i for i in leave_ids if i]),
+                LeaveRequest.user_id.in_(OrgService.report_ids(manager_id, scope))
+            ).order_by(LeaveRequest.id).with_for_update(of=LeaveRequest).all()
+        }
+        
+        results = []
+        decided = []
+        status_updates = []
+        balance_deltas = {}
+        seen = set()
+        
+        for item in decisions:
+            leave_id = item.get('leave_id')
+            decision = item.get('decision')
+            leave_request = owned.get(leave_id)
+            
+            if decision not in ('approve', 'reject'):
+                results.append({'leave_id': leave_id, 'success': False, 'error': "Decision must be 'approve' or 'reject'"})
+                continue
+            if leave_request is None:
+                results.append({'leave_id': leave_id, 'success': False, 'error': 'Leave request not found in your team'})
+                continue
+            if leave_id in seen:
+                results.append({'leave_id': leave_id, 'success': False, 'error': 'Duplicate decision for this request'})
+                continue
+            if leave_request.status != 'pending':
+                results.append({'leave_id': leave_id, 'success': False,
+                                'error': f'Cannot {decision} leave with status: {leave_request.status}'})
+                continue
+            if decision == 'reject' and not item.get('rejection_reason'):
+                results.append({'leave_id': leave_id, 'success': False, 'error': 'Rejection reason is required'})
+                continue
+            
+            seen.add(leave_id)
+            # Written in one batch below rather than flushed as one UPDATE per request
+            status_updates.append({
+                'b_id': leave_id,
+                'b_status': 'approved' if decision == 'approve' else 'rejected',
+                'b_approved_by_id': manager_id,
+                'b_rejection_reason': leave_request.rejection_reason if decision == 'approve' else item['rejection_reason']
+            })
+            
+            key = (leave_request.user_id, leave_request.leave_type_id, leave_request.start_date.year)
+            pending, used = balance_deltas.get(key, (Decimal('0'), Decimal('0')))
+            total_days = Decimal(leave_request.total_days)
+            balance_deltas[key] = (pending - total_days, used + total_days if decision == 'approve' else used)
+            
+            decided.append(leave_id)
+            results.append({'leave_id': leave_id, 'success': True})
+        
+        if status_updates:
+            db.session.execute(
+                update(LeaveRequest.__table__).where(
+                    LeaveRequest.id == bindparam('b_id')
+                ).values(
+                    status=bindparam('b_status'),
+                    approved_by_id=bindparam('b_approved_by_id'),
+                    rejection_reason=bindparam('b_rejection_reason')
+                ),
+                status_updates
+            )
+        
+        if balance_deltas:
+            # Sorted so concurrent bulk decisions lock balance rows in the same order
+            db.session.execute(
+                update(LeaveBalance.__table__).where(
+                    LeaveBalance.user_id == bindparam('b_user_id'),
+                    LeaveBalance.leave_type_id == bindparam('b_leave_type_id'),
+                    LeaveBalance.year == bindparam('b_year')
+                ).values(
+                    pending=LeaveBalance.pending + bindparam('b_pending'),
+                    used=LeaveBalance.used + bindparam('b_used')
+                ),
+                [
+                    {'b_user_id': user_id, 'b_leave_type_id': leave_type_id, 'b_year': year,
+                     'b_pending': pending, 'b_used': used}
+                    for (user_id, leave_type_id, year), (pending, used) in sorted(balance_deltas.items())
+                ]
+            )
+        
+        db.session.commit()
+        
+        if not decided:
+            return results, []
+        
+        # One query refreshes every decided request the commit expired
+        by_id = {lr.id: lr for lr in LeaveRequest.query.filter(LeaveRequest.id.in_(decided)).all()}
+        return results, [by_id[leave_id] for leave_id in decided]
@@ -0,0 +1,31 @@
+from app import db
+from app.models.user import User
+
+SCOPES = ('direct', 'all')
+
+class OrgService:
+
+    @staticmethod
+    def report_ids(manager_id, scope='direct'):
+        """SELECT of the ids reporting to ``manager_id``, for use in ``column.in_(...)``.
+
+        ``direct`` is the manager's immediate team; ``all`` is the whole subtree,
+        walked by a recursive CTE over the indexed ``users.manager_id`` inside
+        the caller's statement, so even a large branch costs one query.
+        UNION (rather than UNION ALL) stops the walk on a manager_id cycle.
+        """
+        if scope == 'direct':
+            return db.select(User.id).where(User.manager_id == manager_id)
+
+        subtree = db.select(User.id).where(User.manager_id == manager_id).cte('org_subtree', recursive=True)
+        subtree = subtree.union(
+            db.select(User.id).join(subtree, User.manager_id == subtree.c.id)
+        )
+        return db.select(subtree.c.id)
+
+    @staticmethod
+    def reports_to(user_id, manager_id, scope='direct'):
+        """Whether ``user_id`` is in ``manager_id``'s team (or subtree for ``all``)"""
+        return db.session.query(
+            db.exists().where(User.id == user_id, User.id.in_(OrgService.report_ids(manager_id, scope)))
+        ).scalar()
@@ -0,0 +1,84 @@
+from datetime import date
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models.leave import LeaveBalance, LeaveRequest
+from app.models.holiday import Holiday, location_holidays
+from app.models.attendance import AttendanceRecord, AttendanceMonthlyRollup
+from app.models.user import User
+from app.utils.serializers import (
+    serialize_attendance_records, serialize_holidays, serialize_leave_balances, serialize_leave_requests
+)
+
+# Statements employee_overview issues, whatever the data looks like
+OVERVIEW_QUERY_BUDGET = 5
+
+class OverviewService:
+
+    @staticmethod
+    def month_summary(rollup, year, month):
+        """Attendance counts for a month from its rollup row (zeros when there is none)"""
+        return {
+            'total_days': rollup.total_days if rollup else 0,
+            'present': rollup.present if rollup else 0,
+            'absent': rollup.absent if rollup else 0,
+            'half_day': rollup.half_day if rollup else 0,
+            'on_leave': rollup.on_leave if rollup else 0,
+            'total_work_hours': float(rollup.total_work_hours) if rollup else 0,
+            'month': month,
+            'year': year
+        }
+
+    @staticmethod
+    def employee_overview(user_id, today=None, holiday_limit=5):
+        """Everything the employee home screen shows, in OVERVIEW_QUERY_BUDGET queries.
+
+        Leave types ride along on the balance and request queries via joined
+        loads, and upcoming holidays are found through the user's location in
+        the same statement, so the count doesn't grow with the data.
+        """
+        if today is None:
+            today = date.today()
+
+        balances = LeaveBalance.query.options(
+            joinedload(LeaveBalance.leave_type)
+        ).filter(
+            LeaveBalance.user_id == user_id,
+            LeaveBalance.year == today.year
+        ).all()
+
+        open_requests = LeaveRequest.query.options(
+            joinedload(LeaveRequest.leave_type)
+        ).filter(
+            LeaveRequest.user_id == user_id,
+            db.or_(
+                LeaveRequest.status == 'pending',
+                db.and_(LeaveRequest.status == 'approved', LeaveRequest.end_date >= today)
+            )
+        ).order_by(LeaveRequest.start_date, LeaveRequest.id).all()
+
+        attendance = AttendanceRecord.query.filter_by(user_id=user_id, date=today).first()
+
+        rollup = db.session.get(AttendanceMonthlyRollup, (user_id, today.year, today.month))
+
+        holidays = Holiday.query.join(
+            location_holidays, location_holidays.c.holiday_id == Holiday.id
+        ).join(
+            User, User.location_id == location_holidays.c.location_id
+        ).filter(
+            User.id == user_id,
+            Holiday.date >= today
+        ).order_by(Holiday.date, Holiday.id).limit(holiday_limit).all()
+
+        return {
+            'date': today,
+            'balances': serialize_leave_balances(balances),
+            'pending_requests': serialize_leave_requests(
+                [lr for lr in open_requests if lr.status == 'pending'], include_user=False
+            ),
+            'upcoming_leave': serialize_leave_requests(
+                [lr for lr in open_requests if lr.status == 'approved'], include_user=False
+            ),
+            'today_attendance': serialize_attendance_records([attendance])[0] if attendance else None,
+            'attendance_this_month': OverviewService.month_summary(rollup, today.year, today.month),
+            'upcoming_holidays': serialize_holidays(holidays)
+        }
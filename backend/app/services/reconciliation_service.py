@@ -0,0 +1,139 @@
+from datetime import date
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, update
+from app import db
+from app.models.leave import LeaveRequest, LeaveBalance
+from app.models.holiday import Holiday, location_holidays
+from app.models.user import User
+
+class ReconciliationService:
+
+    @staticmethod
+    def _load_open_requests(location_ids, today):
+        """Pending requests and approved requests not yet over, with the employee's location.
+
+        The request rows stay locked until the caller commits, so an approval,
+        rejection or cancellation can't move a request's days between pending
+        and used while its delta is being computed.
+        """
+        query = db.session.query(
+            LeaveRequest.id,
+            LeaveRequest.user_id,
+            LeaveRequest.leave_type_id,
+            LeaveRequest.start_date,
+            LeaveRequest.end_date,
+            LeaveRequest.total_days,
+            LeaveRequest.status,
+            User.location_id
+        ).join(
+            User, User.id == LeaveRequest.user_id
+        ).filter(
+            db.or_(
+                LeaveRequest.status == 'pending',
+                db.and_(LeaveRequest.status == 'approved', LeaveRequest.end_date >= today)
+            )
+        )
+
+        if location_ids is not None:
+            query = query.filter(User.location_id.in_(location_ids))
+
+        # Locked in id order, like bulk decisions, so the two can't deadlock
+        query = query.order_by(LeaveRequest.id).with_for_update(of=LeaveRequest)
+
+        return pd.DataFrame(query.all(), columns=[
+            'id', 'user_id', 'leave_type_id', 'start_date', 'end_date', 'total_days', 'status', 'location_id'
+        ])
+
+    @staticmethod
+    def _load_holiday_arrays(location_ids):
+        """Holiday dates per location as datetime64[D] arrays for np.busday_count"""
+        rows = db.session.query(location_holidays.c.location_id, Holiday.date).join(
+            Holiday, Holiday.id == location_holidays.c.holiday_id
+        ).filter(location_holidays.c.location_id.in_(location_ids)).all()
+
+        by_location = {}
+        for location_id, holiday_date in rows:
+            by_location.setdefault(location_id, []).append(holiday_date)
+
+        return {
+            location_id: np.unique(np.array(dates, dtype='datetime64[D]'))
+            for location_id, dates in by_location.items()
+        }
+
+    @staticmethod
+    def reconcile_leave_totals(location_ids=None):
+        """Recompute working days of open leave requests and apply balance deltas in bulk.
+
+        ``location_ids`` limits the pass to employees of those locations; None
+        reconciles every location. Pending requests move ``pending``, approved
+        ones move ``used``. Returns a report of what changed.
+        """
+        today = date.today()
+        requests = ReconciliationService._load_open_requests(location_ids, today)
+        report = {'requests_checked': len(requests), 'requests_updated': 0, 'balances_updated': 0, 'changes': []}
+        if requests.empty:
+            db.session.commit()
+            return report
+
+        holidays = ReconciliationService._load_holiday_arrays(requests['location_id'].unique().tolist())
+
+        starts = requests['start_date'].to_numpy(dtype='datetime64[D]')
+        # busday_count is end-exclusive, leave ranges are inclusive
+        ends = requests['end_date'].to_numpy(dtype='datetime64[D]') + np.timedelta64(1, 'D')
+        new_totals = np.zeros(len(requests), dtype=np.int64)
+
+        for location_id, positions in requests.groupby('location_id').indices.items():
+            location_holidays_array = holidays.get(location_id, np.array([], dtype='datetime64[D]'))
+            new_totals[positions] = np.busday_count(starts[positions], ends[positions], holidays=location_holidays_array)
+
+        requests['new_total_days'] = new_totals
+        requests['delta'] = requests['new_total_days'] - requests['total_days'].astype(float)
+        changed = requests[requests['delta'] != 0]
+        if changed.empty:
+            # Nothing to write; release the row locks
+            db.session.commit()
+            return report
+
+        db.session.execute(
+            update(LeaveRequest),
+            [{'id': r.id, 'total_days': int(r.new_total_days)} for r in changed.itertuples(index=False)]
+        )
+
+        changed = changed.assign(year=[d.year for d in changed['start_date']])
+        deltas = changed.groupby(['user_id', 'leave_type_id', 'year', 'status'])['delta'].sum().reset_index()
+
+        balances = LeaveBalance.__table__
+        for status, column in (('pending', 'pending'), ('approved', 'used')):
+            params = [
+                {'b_user_id': r.user_id, 'b_leave_type_id': r.leave_type_id, 'b_year': int(r.year), 'b_delta': Decimal(str(r.delta))}
+                for r in deltas[deltas['status'] == status].itertuples(index=False)
+            ]
+            if not params:
+                continue
+
+            db.session.execute(
+                balances.update().where(
+                    balances.c.user_id == bindparam('b_user_id'),
+                    balances.c.leave_type_id == bindparam('b_leave_type_id'),
+                    balances.c.year == bindparam('b_year')
+                ).values({column: balances.c[column] + bindparam('b_delta')}),
+                params
+            )
+            report['balances_updated'] += len(params)
+
+        db.session.commit()
+
+        report['requests_updated'] = len(changed)
+        report['changes'] = [
+            {
+                'leave_request_id': r.id,
+                'user_id': r.user_id,
+                'status': r.status,
+                'old_total_days': float(r.total_days),
+                'new_total_days': int(r.new_total_days)
+            }
+            for r in changed.itertuples(index=False)
+        ]
+        return report
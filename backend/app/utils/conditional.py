@@ -0,0 +1,51 @@
+import hashlib
+from datetime import datetime
+from flask import Response, make_response, request
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app import db
+from app.models.version import ResourceVersion
+from app.models.leave import LeaveBalance
+
+def resource_version(name):
+    """Current version counter of a resource (0 if it was never bumped)"""
+    version = db.session.query(ResourceVersion.version).filter(ResourceVersion.name == name).scalar()
+    return version or 0
+
+def bump_resource_version(*names):
+    """Increment resource versions inside the caller's transaction"""
+    for name in names:
+        statement = pg_insert(ResourceVersion.__table__).values(name=name, version=1, updated_at=datetime.utcnow())
+        statement = statement.on_conflict_do_update(
+            index_elements=['name'],
+            set_={'version': ResourceVersion.__table__.c.version + 1, 'updated_at': statement.excluded.updated_at}
+        )
+        db.session.execute(statement)
+
+def leave_balance_version(user_id, year):
+    """(row count, latest updated_at) of a user's balances for a year, from the (user_id, year) index"""
+    return db.session.query(
+        db.func.count(LeaveBalance.id),
+        db.func.max(LeaveBalance.updated_at)
+    ).filter(
+        LeaveBalance.user_id == user_id,
+        LeaveBalance.year == year
+    ).one()
+
+def make_etag(*parts):
+    """Strong ETag from the values that determine a response"""
+    return hashlib.sha256('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()[:32]
+
+def conditional_response(etag, build):
+    """Answer If-None-Match with 304, otherwise build the response and tag it.
+
+    ``build`` is only called on a miss, so the heavy queries and
+    serialization are skipped whenever the client's copy is current.
+    """
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = make_response(build())
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
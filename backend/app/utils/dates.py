@@ -0,0 +1,25 @@
+from datetime import date, timedelta
+from sqlalchemy import and_, false
+
+def date_window(year, month=None, day=None):
+    """Half-open [start, end) date range covering a year, a month or a single day"""
+    if day is not None:
+        start = date(year, month, day)
+        return start, start + timedelta(days=1)
+
+    if month is not None:
+        start = date(year, month, 1)
+        end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        return start, end
+
+    return date(year, 1, 1), date(year + 1, 1, 1)
+
+def in_date_window(column, year, month=None, day=None):
+    """Index-friendly range predicate replacing extract('year'/'month', column) filters"""
+    try:
+        start, end = date_window(year, month, day)
+    except (ValueError, OverflowError):
+        # An impossible year/month matches nothing, as the extract() comparison did
+        return false()
+
+    return and_(column >= start, column < end)
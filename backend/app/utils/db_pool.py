@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+class PoolTelemetry:
+    """Counters for the SQLAlchemy connection pool.
+
+    Wait time is measured around the pool's own checkout, so it is the time a
+    request spent blocked waiting for a free connection (or opening one), not
+    query time. Connection age is tracked from the DBAPI connect.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connected_at = {}
+        self.pool = None
+        self.slow_wait_ms = 100
+        self.log_interval = 0
+        self._last_log = time.monotonic()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.total_wait_ms = 0.0
+            self.max_wait_ms = 0.0
+            self.overflow_events = 0
+            self.timeouts = 0
+            self.connections_opened = 0
+            self.connections_closed = 0
+
+    def init_app(self, app, engine):
+        """Hook the engine's pool events; call inside an app context"""
+        self.pool = engine.pool
+        self.slow_wait_ms = app.config['DB_POOL_SLOW_WAIT_MS']
+        self.log_interval = app.config['DB_POOL_LOG_INTERVAL_SECONDS']
+
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'close', self._on_close)
+        event.listen(engine, 'close_detached', self._on_close_detached)
+        event.listen(engine, 'detach', self._on_detach)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._connected_at[id(dbapi_connection)] = time.monotonic()
+            self.connections_opened += 1
+
+    def _forget(self, dbapi_connection):
+        with self._lock:
+            if self._connected_at.pop(id(dbapi_connection), None) is not None:
+                self.connections_closed += 1
+
+    def _on_close(self, dbapi_connection, connection_record):
+        self._forget(dbapi_connection)
+
+    def _on_close_detached(self, dbapi_connection):
+        self._forget(dbapi_connection)
+
+    def _on_detach(self, dbapi_connection, connection_record):
+        # Detached connections leave the pool's accounting
+        self._forget(dbapi_connection)
+
+    def record_checkout(self, wait_ms, overflowed):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            if overflowed:
+                self.overflow_events += 1
+
+        if overflowed:
+            logger.warning('DB pool overflow: opened connection beyond pool_size (%s)', self._pool_status())
+        if wait_ms >= self.slow_wait_ms:
+            logger.warning('DB pool checkout waited %.1f ms (%s)', wait_ms, self._pool_status())
+        self._maybe_log_summary()
+
+    def record_timeout(self, wait_ms):
+        with self._lock:
+            self.timeouts += 1
+        logger.error('DB pool checkout timed out after %.1f ms (%s)', wait_ms, self._pool_status())
+
+    def _pool_status(self):
+        return self.pool.status() if self.pool is not None else 'no pool'
+
+    def _maybe_log_summary(self):
+        if self.log_interval <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_log < self.log_interval:
+                return
+            self._last_log = now
+        logger.info('DB pool stats: %s', self.stats())
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - connected_at for connected_at in self._connected_at.values()]
+            stats = {
+                'checkouts': self.checkouts,
+                'avg_wait_ms': round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                'max_wait_ms': round(self.max_wait_ms, 3),
+                'overflow_events': self.overflow_events,
+                'timeouts': self.timeouts,
+                'connections_opened': self.connections_opened,
+                'connections_closed': self.connections_closed,
+                'open_connections': len(ages),
+                'max_connection_age_seconds': round(max(ages), 1) if ages else 0.0,
+                'avg_connection_age_seconds': round(sum(ages) / len(ages), 1) if ages else 0.0
+            }
+
+        pool = self.pool
+        if isinstance(pool, QueuePool):
+            stats.update({
+                'pool_size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': pool.overflow()
+            })
+        return stats
+
+pool_telemetry = PoolTelemetry()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports checkout wait time, overflow and timeouts to ``pool_telemetry``"""
+
+    def _do_get(self):
+        overflow_before = self.overflow()
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_telemetry.record_timeout((time.perf_counter() - started) * 1000)
+            raise
+
+        overflowed = self.overflow() > overflow_before and self.overflow() > 0
+        pool_telemetry.record_checkout((time.perf_counter() - started) * 1000, overflowed)
+        return connection
+
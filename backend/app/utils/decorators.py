@@ -2,6 +2,7 @@ from functools import wraps
 from flask import request, jsonify
 import jwt
 import os
+from app.utils.token_cache import verified_tokens
 
 def require_auth(f):
     """Decorator to require valid JWT token"""
@@ -13,7 +14,10 @@ def require_auth(f):
             return jsonify({'error': 'No token provided'}), 401
         
         try:
-            payload = jwt.decode(token, os.getenv('JWT_SECRET'), algorithms=['HS256'])
+            payload = verified_tokens.get('internal', token)
+            if payload is None:
+                payload = jwt.decode(token, os.getenv('JWT_SECRET'), algorithms=['HS256'])
+                verified_tokens.put('internal', token, payload)
             request.user = payload
             return f(*args, **kwargs)
         except jwt.ExpiredSignatureError:
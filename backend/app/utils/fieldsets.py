@@ -0,0 +1,51 @@
+from flask import request
+from sqlalchemy.orm import load_only
+
+class InvalidFields(ValueError):
+    pass
+
+def requested_fields(allowed):
+    """Names from ``?fields=a,b,c`` in request order, or None for the full representation.
+
+    Raises InvalidFields when a name is not one of ``allowed``.
+    """
+    raw = request.args.get('fields')
+    if not raw:
+        return None
+
+    fields = []
+    for name in raw.split(','):
+        name = name.strip()
+        if name and name not in fields:
+            fields.append(name)
+    if not fields:
+        return None
+
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise InvalidFields(f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return tuple(fields)
+
+def sparse_columns(fields, column_fields, extras, required=()):
+    """Column names needed to serialize ``fields``: id, requested columns, extras' dependencies and ``required``"""
+    needed = ['id']
+    for name in fields:
+        for column in extras.get(name, (name,) if name in column_fields else ()):
+            if column not in needed:
+                needed.append(column)
+    for column in required:
+        if column.key not in needed:
+            needed.append(column.key)
+    return needed
+
+def load_fields(query, model, fields, column_fields, extras, required=()):
+    """Restrict ``query`` to the columns behind a sparse fieldset with ``load_only``.
+
+    ``extras`` maps computed/relationship field names to the columns they
+    are built from; ``required`` lists columns the caller reads itself, such
+    as keyset pagination columns. A None fieldset leaves the query as is.
+    """
+    if fields is None:
+        return query
+    columns = sparse_columns(fields, column_fields, extras, required)
+    return query.options(load_only(*[getattr(model, name) for name in columns]))
@@ -0,0 +1,184 @@
+import hmac
+import threading
+import time
+from flask import Response, current_app, has_request_context, jsonify, request
+from sqlalchemy import event
+from app.utils.db_pool import pool_telemetry
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.bounds = tuple(buckets) + (float('inf'),)
+        self.counts = [0] * len(self.bounds)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, **labels):
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{_labels(**labels, le=_format_bound(bound))} {cumulative}'
+        yield f'{name}_sum{_labels(**labels)} {self.sum}'
+        yield f'{name}_count{_labels(**labels)} {self.count}'
+
+class RequestMetrics:
+    """Per-endpoint request latency, status codes and SQL usage in Prometheus text format.
+
+    Endpoints are labelled by Flask endpoint name (``employee.get_leave_balance``)
+    rather than path, so label cardinality stays bounded. SQL statements and
+    their time are attributed to the request whose context executes them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.latency = {}
+            self.queries_per_request = {}
+            self.requests = {}
+            self.sql_statements = {}
+            self.sql_seconds = {}
+
+    def init_app(self, app, engine):
+        """Register request hooks, SQL cursor events and the /metrics route"""
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+    @staticmethod
+    def _start_request():
+        # Kept on the request environ rather than g: batched sub-requests share g with their batch
+        request.environ['metrics.started'] = time.perf_counter()
+        request.environ['metrics.sql_statements'] = 0
+        request.environ['metrics.sql_seconds'] = 0.0
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context, which is discarded with a failed statement
+        context._query_start = time.perf_counter()
+
+    @staticmethod
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_query_start', None)
+        # Background jobs run with an app context but no request; only requests are attributed
+        if started is not None and has_request_context() and 'metrics.sql_statements' in request.environ:
+            request.environ['metrics.sql_statements'] += 1
+            request.environ['metrics.sql_seconds'] += time.perf_counter() - started
+
+    def _finish_request(self, response):
+        environ = request.environ
+        started = environ.pop('metrics.started', None)
+        if started is None:
+            return response
+
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint or 'unmatched'
+        method = request.method
+        statements = environ.get('metrics.sql_statements', 0)
+        sql_seconds = environ.get('metrics.sql_seconds', 0.0)
+
+        key = (method, endpoint)
+        with self._lock:
+            self.latency.setdefault(key, _Histogram(LATENCY_BUCKETS)).observe(elapsed)
+            self.queries_per_request.setdefault(key, _Histogram(QUERY_COUNT_BUCKETS)).observe(statements)
+            status_key = (method, endpoint, response.status_code)
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            self.sql_statements[key] = self.sql_statements.get(key, 0) + statements
+            self.sql_seconds[key] = self.sql_seconds.get(key, 0.0) + sql_seconds
+
+        return response
+
+    def render(self):
+        """Prometheus text exposition of everything recorded so far"""
+        lines = []
+        with self._lock:
+            lines.append('# HELP http_requests_total HTTP requests by endpoint and status code.')
+            lines.append('# TYPE http_requests_total counter')
+            for (method, endpoint, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{_labels(method=method, endpoint=endpoint, status=status)} {count}')
+
+            lines.append('# HELP http_request_duration_seconds Request latency by endpoint.')
+            lines.append('# TYPE http_request_duration_seconds histogram')
+            for (method, endpoint), histogram in sorted(self.latency.items()):
+                lines.extend(histogram.lines('http_request_duration_seconds', method=method, endpoint=endpoint))
+
+            lines.append('# HELP db_queries_per_request SQL statements executed per request.')
+            lines.append('# TYPE db_queries_per_request histogram')
+            for (method, endpoint), histogram in sorted(self.queries_per_request.items()):
+                lines.extend(histogram.lines('db_queries_per_request', method=method, endpoint=endpoint))
+
+            lines.append('# HELP db_queries_total SQL statements executed by endpoint.')
+            lines.append('# TYPE db_queries_total counter')
+            for (method, endpoint), count in sorted(self.sql_statements.items()):
+                lines.append(f'db_queries_total{_labels(method=method, endpoint=endpoint)} {count}')
+
+            lines.append('# HELP db_query_seconds_total Time spent executing SQL by endpoint.')
+            lines.append('# TYPE db_query_seconds_total counter')
+            for (method, endpoint), seconds in sorted(self.sql_seconds.items()):
+                lines.append(f'db_query_seconds_total{_labels(method=method, endpoint=endpoint)} {seconds}')
+
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def render_pool():
+        """Connection pool gauges and counters from ``pool_telemetry``"""
+        stats = pool_telemetry.stats()
+        if 'overflow' in stats:
+            # QueuePool reports overflow as negative while below pool_size
+            stats['overflow'] = max(stats['overflow'], 0)
+        metrics = [
+            ('db_pool_checked_out', 'gauge', 'checked_out', 'Connections currently checked out.'),
+            ('db_pool_overflow', 'gauge', 'overflow', 'Connections open beyond pool_size.'),
+            ('db_pool_max_connection_age_seconds', 'gauge', 'max_connection_age_seconds', 'Age of the oldest pooled connection.'),
+            ('db_pool_checkouts_total', 'counter', 'checkouts', 'Connection checkouts.'),
+            ('db_pool_overflow_events_total', 'counter', 'overflow_events', 'Checkouts that opened an overflow connection.'),
+            ('db_pool_timeouts_total', 'counter', 'timeouts', 'Checkouts that timed out waiting for a connection.')
+        ]
+        lines = []
+        for name, kind, key, help_text in metrics:
+            if key in stats:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                lines.append(f'{name} {stats[key]}')
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def metrics_view(self):
+        """Scrape endpoint; requires ``Authorization: Bearer <METRICS_TOKEN>``"""
+        token = current_app.config.get('METRICS_TOKEN')
+        if not token:
+            return jsonify({'error': 'Metrics endpoint is disabled: METRICS_TOKEN is not set'}), 403
+
+        header = request.headers.get('Authorization', '')
+        if not header.startswith('Bearer ') or not hmac.compare_digest(header[len('Bearer '):], token):
+            return jsonify({'error': 'Invalid metrics token'}), 401
+
+        return Response(self.render() + self.render_pool(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,157 @@
+import base64
+import json
+import math
+import uuid
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from flask import request
+from sqlalchemy import and_, or_, types
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(values):
+    """Opaque cursor for the sort-key values of the last row on a page"""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values],
+        separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, columns):
+    """Decode a cursor back into typed values for the given sort columns"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError('cursor shape mismatch')
+        return [_coerce(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError, UnicodeError, OverflowError):
+        raise InvalidCursor('Invalid cursor')
+
+INTEGER_BOUNDS = {
+    types.SmallInteger: 2 ** 15,
+    types.BigInteger: 2 ** 63,
+    types.Integer: 2 ** 31
+}
+
+def _coerce(column, value):
+    """Check a decoded cursor value against its column type and convert it.
+
+    Cursors come back from clients, so anything that wouldn't bind cleanly
+    (wrong JSON type, out-of-range number, malformed id or date) raises
+    ValueError here rather than failing in the database.
+    """
+    if value is None:
+        if not column.nullable:
+            raise ValueError(f'{column.key} cannot be null')
+        return None
+
+    column_type = column.type
+    if isinstance(column_type, types.DateTime):
+        return datetime.fromisoformat(_expect(value, str))
+    if isinstance(column_type, types.Date):
+        return date.fromisoformat(_expect(value, str))
+    if isinstance(column_type, types.Boolean):
+        return _expect(value, bool)
+    if isinstance(column_type, types.Integer):
+        value = _expect(value, int)
+        bound = next(b for t, b in INTEGER_BOUNDS.items() if isinstance(column_type, t))
+        if not -bound <= value < bound:
+            raise ValueError(f'{column.key} out of range')
+        return value
+    if isinstance(column_type, types.Numeric):
+        try:
+            number = Decimal(str(_expect(value, (int, float, str))))
+        except InvalidOperation:
+            raise ValueError(f'{column.key} is not a number')
+        if not number.is_finite():
+            raise ValueError(f'{column.key} is not a finite number')
+        return number if column_type.asdecimal else float(number)
+    if isinstance(column_type, types.Uuid):
+        parsed = uuid.UUID(_expect(value, str))
+        return parsed if column_type.as_uuid else str(parsed)
+    if isinstance(column_type, types.Enum):
+        if value not in column_type.enums:
+            raise ValueError(f'{column.key} is not a valid value')
+        return value
+    if isinstance(column_type, types.String):
+        value = _expect(value, str)
+        if '\x00' in value or (column_type.length and len(value) > column_type.length):
+            raise ValueError(f'{column.key} is not a valid value')
+        # Ids are String(36) UUIDs
+        if column_type.length == 36:
+            uuid.UUID(value)
+        return value
+    raise ValueError(f'{column.key} cannot be used in a cursor')
+
+def _expect(value, expected):
+    # bool is an int subclass, but never a valid number here
+    if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+        raise ValueError('cursor value has the wrong type')
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ValueError('cursor value is not finite')
+    return value
+
+def _after(keyset, values):
+    """Rows strictly after ``values`` in keyset order, as an index-friendly OR chain"""
+    clauses = []
+    for i, (column, direction) in enumerate(keyset):
+        comparison = column < values[i] if direction == 'desc' else column > values[i]
+        equal_prefix = [c == v for (c, _), v in zip(keyset[:i], values[:i])]
+        clauses.append(and_(*equal_prefix, comparison))
+    return or_(*clauses)
+
+def _flag(name, default):
+    value = request.args.get(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes')
+
+def paginate_request(query, keyset, default_per_page=20):
+    """Paginate ``query`` according to the request args.
+
+    ``keyset`` is a list of ``(column, 'asc'|'desc')`` pairs that uniquely
+    orders the rows. By default this is classic page/per_page pagination.
+    Passing ``cursor`` (empty for the first page) switches to keyset mode,
+    where each page seeks past the previous page's last row instead of using
+    OFFSET, and the response carries ``next_cursor``. ``include_total=false``
+    skips the COUNT(*) query; keyset mode skips it unless asked for.
+
+    Returns ``(items, page_info)``; raises InvalidCursor for a malformed cursor.
+    """
+    per_page = request.args.get('per_page', default_per_page, type=int)
+    ordered = query.order_by(*[c.desc() if d == 'desc' else c.asc() for c, d in keyset])
+
+    if 'cursor' not in request.args:
+        page = request.args.get('page', 1, type=int)
+        include_total = _flag('include_total', True)
+        pagination = ordered.paginate(page=page, per_page=per_page, error_out=False, count=include_total)
+        page_info = {
+            'total': pagination.total,
+            'page': page,
+            'per_page': per_page,
+            'pages': pagination.pages
+        }
+        return pagination.items, page_info
+
+    if per_page < 1:
+        per_page = default_per_page
+
+    columns = [c for c, _ in keyset]
+    cursor = request.args.get('cursor')
+    if cursor:
+        ordered = ordered.filter(_after(keyset, decode_cursor(cursor, columns)))
+
+    rows = ordered.limit(per_page + 1).all()
+    items = rows[:per_page]
+
+    next_cursor = None
+    if len(rows) > per_page:
+        next_cursor = encode_cursor([getattr(items[-1], c.key) for c in columns])
+
+    page_info = {'per_page': per_page, 'next_cursor': next_cursor}
+    if _flag('include_total', False):
+        page_info['total'] = query.order_by(None).count()
+
+    return items, page_info
@@ -0,0 +1,24 @@
+from app import db
+from app.models.user import User
+
+def escape_like(term):
+    """Escape LIKE wildcards so user input matches literally"""
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def user_search_filter(term):
+    """Substring match on email/first/last name; served by the pg_trgm GIN indexes"""
+    pattern = f'%{escape_like(term)}%'
+    return db.or_(
+        User.email.ilike(pattern, escape='\\'),
+        User.first_name.ilike(pattern, escape='\\'),
+        User.last_name.ilike(pattern, escape='\\')
+    )
+
+def user_prefix_filter(term):
+    """Case-insensitive prefix match; served by the lower(...) text_pattern_ops indexes"""
+    pattern = f'{escape_like(term.lower())}%'
+    return db.or_(
+        db.func.lower(User.email).like(pattern, escape='\\'),
+        db.func.lower(User.first_name).like(pattern, escape='\\'),
+        db.func.lower(User.last_name).like(pattern, escape='\\')
+    )
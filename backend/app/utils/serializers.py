@@ -0,0 +1,254 @@
+from functools import lru_cache
+from operator import attrgetter
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from app import db
+from app.models.user import User, Location
+from app.models.leave import LeaveType, LeaveBalance, LeaveRequest
+from app.models.attendance import AttendanceRecord
+from app.models.holiday import Holiday, location_holidays
+
+# Column fields each model's to_dict emits, in the same order
+USER_FIELDS = ('id', 'email', 'first_name', 'last_name', 'role', 'manager_id', 'location_id',
+               'is_active', 'created_at', 'updated_at')
+LOCATION_FIELDS = ('id', 'name', 'country', 'state', 'city', 'timezone', 'created_at')
+LEAVE_TYPE_FIELDS = ('id', 'name', 'code', 'requires_approval', 'max_days_per_request', 'description')
+LEAVE_BALANCE_FIELDS = ('id', 'user_id', 'leave_type_id', 'year', 'total_allocated', 'used', 'pending',
+                        'created_at', 'updated_at')
+LEAVE_REQUEST_FIELDS = ('id', 'user_id', 'leave_type_id', 'start_date', 'end_date', 'total_days', 'reason',
+                        'status', 'applied_by_id', 'approved_by_id', 'rejection_reason', 'created_at', 'updated_at')
+ATTENDANCE_FIELDS = ('id', 'user_id', 'date', 'check_in_time', 'check_out_time', 'status', 'work_hours',
+                     'notes', 'created_at', 'updated_at')
+HOLIDAY_FIELDS = ('id', 'name', 'date', 'is_mandatory', 'description', 'created_at')
+
+# Computed and relationship fields, mapped to the columns they are built from
+USER_EXTRAS = {'full_name': ('first_name', 'last_name')}
+LEAVE_REQUEST_EXTRAS = {'leave_type': ('leave_type_id',), 'employee': ('user_id',)}
+ATTENDANCE_EXTRAS = {'employee': ('user_id',)}
+
+EMPLOYEE_SUMMARY_COLUMNS = (User.id, User.first_name, User.last_name, User.email)
+EMPLOYEE_SUMMARY_FIELDS = ('id', 'name', 'email')
+
+@lru_cache(maxsize=None)
+def compile_serializer(model, fields):
+    """Build a row -> dict function for a fixed tuple of column names.
+
+    All columns are read with a single ``attrgetter`` call and zipped onto
+    the keys. Numeric columns become floats (None when a nullable one is
+    empty, as in ``to_dict``); dates and datetimes stay native for the JSON
+    provider to encode.
+    """
+    columns = model.__table__.columns
+    getter = attrgetter(*fields)
+    numeric = [(i, columns[f].nullable) for i, f in enumerate(fields) if isinstance(columns[f].type, db.Numeric)]
+
+    if len(fields) == 1:
+        key = fields[0]
+        if numeric:
+            nullable = numeric[0][1]
+            return lambda obj: {key: _to_float(getter(obj), nullable)}
+        return lambda obj: {key: getter(obj)}
+
+    if not numeric:
+        return lambda obj: dict(zip(fields, getter(obj)))
+
+    def serialize(obj):
+        values = list(getter(obj))
+        for i, nullable in numeric:
+            values[i] = _to_float(values[i], nullable)
+        return dict(zip(fields, values))
+
+    return serialize
+
+def _to_float(value, nullable):
+    if nullable:
+        return float(value) if value else None
+    return float(value)
+
+def _employee_summaries(users):
+    """id -> {'id', 'name', 'email'}, built once per distinct user"""
+    return {
+        user.id: {'id': user.id, 'name': f"{user.first_name} {user.last_name}", 'email': user.email}
+        for user in users if user is not None
+    }
+
+def _sparse(fields, column_fields):
+    """Column subset of a sparse fieldset, always led by id"""
+    return ('id',) + tuple(f for f in fields if f in column_fields and f != 'id')
+
+def _leave_type_dicts(leave_types):
+    """id -> serialized leave type, built once per distinct type"""
+    serialize = compile_serializer(LeaveType, LEAVE_TYPE_FIELDS)
+    return {lt.id: serialize(lt) for lt in leave_types if lt is not None}
+
+def _unloaded(objects, attr):
+    """Objects in the list whose relationship ``attr`` hasn't been loaded yet"""
+    return [obj for obj in objects if attr in inspect(obj).unloaded]
+
+def preload_many_to_one(objects, attr, fk_attr, model, columns=None):
+    """Load a many-to-one relationship for a whole result set with one IN query.
+
+    ``columns`` limits the related rows to those columns via ``load_only``.
+    """
+    pending = _unloaded(objects, attr)
+    ids = {getattr(obj, fk_attr) for obj in pending} - {None}
+
+    related = {}
+    if ids:
+        query = model.query.filter(model.id.in_(ids))
+        if columns:
+            query = query.options(load_only(*columns))
+        related = {r.id: r for r in query.all()}
+
+    for obj in pending:
+        set_committed_value(obj, attr, related.get(getattr(obj, fk_attr)))
+
+def preload_holiday_locations(holidays):
+    """Load Holiday.locations for a list of holidays with one query"""
+    pending = _unloaded(holidays, 'locations')
+    if not pending:
+        return
+
+    rows = db.session.query(location_holidays.c.holiday_id, Location).join(
+        Location, Location.id == location_holidays.c.location_id
+    ).filter(
+        location_holidays.c.holiday_id.in_([h.id for h in pending])
+    ).all()
+
+    locations_by_holiday = {}
+    for holiday_id, location in rows:
+        locations_by_holiday.setdefault(holiday_id, []).append(location)
+
+    for holiday in pending:
+        set_committed_value(holiday, 'locations', locations_by_holiday.get(holiday.id, []))
+
+def serialize_leave_requests(leave_requests, include_user=True, fields=None):
+    """Serialize leave requests with leave types and employees loaded in bulk.
+
+    With a sparse ``fields`` tuple only those keys (plus id) are emitted and
+    relationships that weren't asked for are never loaded.
+    """
+    columns = LEAVE_REQUEST_FIELDS if fields is None else _sparse(fields, LEAVE_REQUEST_FIELDS)
+    with_leave_type = fields is None or 'leave_type' in fields
+    include_user = include_user and (fields is None or 'employee' in fields)
+
+    if with_leave_type:
+        preload_many_to_one(leave_requests, 'leave_type', 'leave_type_id', LeaveType)
+        leave_types = _leave_type_dicts({lr.leave_type for lr in leave_requests})
+    if include_user:
+        preload_many_to_one(leave_requests, 'employee', 'user_id', User, EMPLOYEE_SUMMARY_COLUMNS)
+        employees = _employee_summaries({lr.employee for lr in leave_requests})
+
+    serialize = compile_serializer(LeaveRequest, columns)
+    result = []
+    for lr in leave_requests:
+        data = serialize(lr)
+        if with_leave_type:
+            data['leave_type'] = leave_types.get(lr.leave_type_id)
+        if include_user and lr.user_id in employees:
+            data['employee'] = employees[lr.user_id]
+        result.append(data)
+    return result
+
+def _nested(name, fields):
+    """Dotted export column names for a nested object's fields"""
+    return tuple(f'{name}.{field}' for field in fields)
+
+def leave_request_export_columns(include_user=True, fields=None):
+    """Flattened column names of ``serialize_leave_requests`` output, in order, for CSV exports"""
+    columns = LEAVE_REQUEST_FIELDS if fields is None else _sparse(fields, LEAVE_REQUEST_FIELDS)
+    if fields is None or 'leave_type' in fields:
+        columns += _nested('leave_type', LEAVE_TYPE_FIELDS)
+    if include_user and (fields is None or 'employee' in fields):
+        columns += _nested('employee', EMPLOYEE_SUMMARY_FIELDS)
+    return columns
+
+def serialize_leave_balances(balances):
+    """Serialize leave balances with leave types loaded in bulk"""
+    preload_many_to_one(balances, 'leave_type', 'leave_type_id', LeaveType)
+    leave_types = _leave_type_dicts({b.leave_type for b in balances})
+
+    serialize = compile_serializer(LeaveBalance, LEAVE_BALANCE_FIELDS)
+    result = []
+    for b in balances:
+        data = serialize(b)
+        data['leave_type'] = leave_types.get(b.leave_type_id)
+        data['available'] = data['total_allocated'] - data['used'] - data['pending']
+        result.append(data)
+    return result
+
+def serialize_attendance_records(records, include_user=False, fields=None):
+    """Serialize attendance records with employees loaded in bulk; ``fields`` selects a sparse subset"""
+    columns = ATTENDANCE_FIELDS if fields is None else _sparse(fields, ATTENDANCE_FIELDS)
+    include_user = include_user and (fields is None or 'employee' in fields)
+
+    serialize = compile_serializer(AttendanceRecord, columns)
+    if not include_user:
+        return [serialize(ar) for ar in records]
+
+    preload_many_to_one(records, 'user', 'user_id', User, EMPLOYEE_SUMMARY_COLUMNS)
+    employees = _employee_summaries({ar.user for ar in records})
+    result = []
+    for ar in records:
+        data = serialize(ar)
+        if ar.user_id in employees:
+            data['employee'] = employees[ar.user_id]
+        result.append(data)
+    return result
+
+def attendance_export_columns(include_user=False, fields=None):
+    """Flattened column names of ``serialize_attendance_records`` output, in order, for CSV exports"""
+    columns = ATTENDANCE_FIELDS if fields is None else _sparse(fields, ATTENDANCE_FIELDS)
+    if include_user and (fields is None or 'employee' in fields):
+        columns += _nested('employee', EMPLOYEE_SUMMARY_FIELDS)
+    return columns
+
+def serialize_users(users, fields=None):
+    """Serialize users without going through User.to_dict per row; ``fields`` selects a sparse subset"""
+    columns = USER_FIELDS if fields is None else _sparse(fields, USER_FIELDS)
+    with_full_name = fields is None or 'full_name' in fields
+
+    serialize = compile_serializer(User, columns)
+    if not with_full_name:
+        return [serialize(user) for user in users]
+
+    result = []
+    for user in users:
+        data = serialize(user)
+        data['full_name'] = f"{user.first_name} {user.last_name}"
+        result.append(data)
+    return result
+
+def user_export_columns(fields=None):
+    """Column names of ``serialize_users`` output, in order, for CSV exports"""
+    columns = USER_FIELDS if fields is None else _sparse(fields, USER_FIELDS)
+    if fields is None or 'full_name' in fields:
+        columns += ('full_name',)
+    return columns
+
+def serialize_locations(locations):
+    """Serialize locations without going through Location.to_dict per row"""
+    serialize = compile_serializer(Location, LOCATION_FIELDS)
+    return [serialize(loc) for loc in locations]
+
+def serialize_holidays(holidays, include_locations=False):
+    """Serialize holidays with their locations loaded in bulk"""
+    serialize = compile_serializer(Holiday, HOLIDAY_FIELDS)
+    if not include_locations:
+        return [serialize(h) for h in holidays]
+
+    preload_holiday_locations(holidays)
+    serialize_location = compile_serializer(Location, LOCATION_FIELDS)
+    locations = {}
+    for h in holidays:
+        for loc in h.locations:
+            if loc.id not in locations:
+                locations[loc.id] = serialize_location(loc)
+
+    result = []
+    for h in holidays:
+        data = serialize(h)
+        data['locations'] = [locations[loc.id] for loc in h.locations]
+        result.append(data)
+    return result
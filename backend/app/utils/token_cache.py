@@ -0,0 +1,82 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+class VerifiedTokenCache:
+    """Bounded LRU cache of verified JWT claims.
+
+    Entries are keyed by a SHA-256 of the raw token (plus a scheme name, so a
+    token verified by one decorator is never trusted by another) and expire at
+    the token's own ``exp`` claim, so expiry behaves exactly as without the cache.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def init_app(self, app):
+        """Size the cache from TOKEN_CACHE_MAX_SIZE, dropping the oldest entries if it shrank"""
+        with self._lock:
+            self.maxsize = app.config['TOKEN_CACHE_MAX_SIZE']
+            while len(self._entries) > max(self.maxsize, 0):
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    @staticmethod
+    def _key(scheme, token):
+        return scheme, hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, scheme, token):
+        """Return cached claims for a token, or None if absent or expired"""
+        key = self._key(scheme, token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, scheme, token, claims):
+        """Cache verified claims until the token's exp; tokens without exp are not cached"""
+        expires_at = claims.get('exp')
+        if not isinstance(expires_at, (int, float)) or self.maxsize <= 0:
+            return
+
+        key = self._key(scheme, token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+# Shared by app.auth.token_required and app.utils.decorators.require_auth; sized by create_app
+verified_tokens = VerifiedTokenCache()
@@ -0,0 +1,4 @@
+"""Synthetic data generator and in-process benchmark runner.
+
+Run against a dedicated database: ``flask bench seed`` then ``flask bench run``.
+"""
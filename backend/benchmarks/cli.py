@@ -0,0 +1,58 @@
+import json
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from benchmarks.seed import seed_organization
+from benchmarks.runner import run_benchmarks
+
+bench_cli = AppGroup('bench', help='Synthetic data and performance benchmarks')
+
+@bench_cli.command('seed')
+@click.option('--locations', default=3, show_default=True, help='Number of locations')
+@click.option('--employees', default=500, show_default=True, help='Number of users in the org tree')
+@click.option('--span', default=8, show_default=True, help='Direct reports per manager')
+@click.option('--years', default=2, show_default=True, help='Years of attendance and leave history')
+@click.option('--holidays-per-year', default=10, show_default=True, help='Holidays per location per year')
+@click.option('--requests-per-year', default=4, show_default=True, help='Leave requests per user per year')
+@click.option('--seed', default=42, show_default=True, help='Random seed, for reproducible data')
+def seed(locations, employees, span, years, holidays_per_year, requests_per_year, seed):
+    """Seed a synthetic organization into the configured database"""
+    if span < 1:
+        raise click.UsageError('--span must be at least 1')
+    try:
+        counts = seed_organization(
+            locations=locations, employees=employees, span=span, years=years,
+            holidays_per_year=holidays_per_year, requests_per_year=requests_per_year,
+            seed=seed, progress=lambda step: click.echo(f'Seeded {step}')
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(json.dumps(counts, indent=2))
+
+@bench_cli.command('run')
+@click.option('--iterations', default=50, show_default=True, help='Measured requests per scenario')
+@click.option('--warmup', default=5, show_default=True, help='Unmeasured requests per scenario')
+@click.option('--scenario', 'scenarios', multiple=True, help='Only run this scenario (repeatable)')
+@click.option('--upload-rows', default=500, show_default=True, help='Rows per bulk attendance upload')
+@click.option('--output', type=click.Path(dir_okay=False, writable=True), help='Write the JSON report here')
+def run(iterations, warmup, scenarios, upload_rows, output):
+    """Benchmark key endpoints in-process and report latency, queries and memory as JSON"""
+    try:
+        report = run_benchmarks(
+            current_app._get_current_object(), iterations=iterations, warmup=warmup,
+            only=set(scenarios) or None, upload_rows=upload_rows
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    body = json.dumps(report, indent=2)
+    if output:
+        with open(output, 'w') as f:
+            f.write(body + '\n')
+        click.echo(f'Wrote benchmark report to {output}')
+    else:
+        click.echo(body)
+    
+    over_budget = [name for name, result in report['results'].items() if result.get('within_query_budget') is False]
+    if over_budget:
+        raise click.ClickException(f"Query budget exceeded by: {', '.join(over_budget)}")
@@ -0,0 +1,265 @@
+import io
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from flask import g, request
+from sqlalchemy import event
+from app import db
+from app.models.user import User
+from app.models.leave import LeaveRequest, LeaveType
+from app.services.leave_service import LeaveService
+from app.services.overview_service import OVERVIEW_QUERY_BUDGET
+from app.utils.token_cache import verified_tokens
+from app.utils.serializers import serialize_leave_requests
+from benchmarks.seed import EMAIL_DOMAIN, LEAVE_TYPES, bench_admin_email
+
+TOKEN_LIFETIME_SECONDS = 3600
+SERIALIZATION_ROWS = 1000
+
+# Scenarios whose SQL statement count must not exceed a fixed budget
+QUERY_BUDGETS = {'employee_overview': OVERVIEW_QUERY_BUDGET}
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'after_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'after_cursor_execute', self._on_execute)
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _install_bench_auth(app):
+    """Authenticate benchmark tokens on every route.
+
+    The bench tokens are pre-seeded into the verified token cache, which is
+    what ``token_required`` consults first; this hook applies the same cache
+    lookup to routes that only carry ``require_role``.
+    """
+    @app.before_request
+    def bench_auth():
+        header = request.headers.get('Authorization', '')
+        if header.startswith('Bearer bench-'):
+            claims = verified_tokens.get('keycloak', header.split(' ', 1)[1])
+            if claims is not None:
+                g.user = claims
+
+def _bench_token(user):
+    token = f'bench-{user.id}'
+    verified_tokens.put('keycloak', token, {
+        'user_id': user.id,
+        'email': user.email,
+        'role': user.role,
+        'exp': time.time() + TOKEN_LIFETIME_SECONDS
+    })
+    return {'Authorization': f'Bearer {token}'}
+
+def _pick_subjects():
+    """A leaf employee, their manager, and the bench admin"""
+    employee = User.query.filter(
+        User.email.like(f'%@{EMAIL_DOMAIN}'),
+        User.role == 'employee',
+        User.manager_id.isnot(None)
+    ).order_by(User.email).first()
+    if employee is None:
+        raise ValueError('No benchmark data found; run `flask bench seed` first')
+
+    manager = User.query.get(employee.manager_id)
+    admin = User.query.filter_by(email=bench_admin_email()).one()
+    return employee, manager, admin
+
+def _leave_day(user_id):
+    """First weekday of the current year that is a working day for the user"""
+    day = date(date.today().year, 1, 1)
+    for _ in range(366):
+        if LeaveService.calculate_leave_days(day, day, user_id):
+            return day
+        day += timedelta(days=1)
+    raise ValueError('Benchmark employee has no working day this year')
+
+def _attendance_csv(user_ids, rows):
+    """A bulk attendance upload re-marking recent weekdays for a set of users"""
+    lines = ['user_id,date,status,notes']
+    day = date.today()
+    days = []
+    while len(days) < max(1, rows // max(1, len(user_ids))):
+        day -= timedelta(days=1)
+        if day.weekday() < 5:
+            days.append(day)
+    for user_id in user_ids:
+        for d in days:
+            lines.append(f'{user_id},{d.isoformat()},present,benchmark')
+    return '\n'.join(lines).encode('utf-8')
+
+def _scenarios(app, client, employee, manager, admin, upload_rows):
+    """(name, callable) pairs; each callable performs one request and returns the response"""
+    today = date.today()
+    employee_auth = _bench_token(employee)
+    manager_auth = _bench_token(manager)
+    admin_auth = _bench_token(admin)
+
+    leave_type = LeaveType.query.filter_by(code=LEAVE_TYPES[0][0]).one()
+    leave_day = _leave_day(employee.id).isoformat()
+    applied = []
+
+    def apply_leave():
+        response = client.post('/api/employee/leave', headers=employee_auth, json={
+            'leave_type_id': leave_type.id,
+            'start_date': leave_day,
+            'end_date': leave_day,
+            'reason': 'Benchmark'
+        })
+        if response.status_code == 201:
+            applied.append(response.get_json()['id'])
+        return response
+
+    def approve_leave():
+        if applied:
+            leave_id = applied.pop()
+        else:
+            with app.app_context():
+                leave_id = db.session.query(LeaveRequest.id).filter_by(
+                    user_id=employee.id, status='pending'
+                ).limit(1).scalar()
+        return client.put(f'/api/manager/leave/{leave_id}/approve', headers=manager_auth)
+
+    team_ids = [user_id for user_id, in db.session.query(User.id).filter_by(manager_id=manager.id)]
+
+    def bulk_upload():
+        response = client.post('/api/admin/attendance/bulk-upload', headers=admin_auth, data={
+            'file': (io.BytesIO(_attendance_csv(team_ids, upload_rows)), 'bench_attendance.csv')
+        }, content_type='multipart/form-data')
+        if response.status_code != 202:
+            return response
+
+        # Time the upload end to end, including the background import
+        job_id = response.get_json()['job']['id']
+        while True:
+            job = client.get(f'/api/admin/jobs/{job_id}', headers=admin_auth)
+            if job.status_code != 200 or job.get_json()['status'] in ('completed', 'failed'):
+                return job
+            time.sleep(0.01)
+
+    return [
+        ('employee_balance', lambda: client.get('/api/employee/balance', headers=employee_auth)),
+        ('employee_overview', lambda: client.get('/api/employee/overview', headers=employee_auth)),
+        ('employee_leave_apply', apply_leave),
+        ('manager_leave_approve', approve_leave),
+        ('manager_team_attendance', lambda: client.get(
+            f'/api/manager/team/attendance?year={today.year}&month={today.month}', headers=manager_auth)),
+        ('admin_attendance_reports', lambda: client.get(
+            f'/api/admin/attendance/reports?year={today.year}&month={today.month}', headers=admin_auth)),
+        ('admin_attendance_bulk_upload', bulk_upload)
+    ]
+
+def _serialization_scenarios(app):
+    """Serializing SERIALIZATION_ROWS leave requests: per-row to_dict + stdlib json vs compiled serializers + app provider"""
+    rows = LeaveRequest.query.order_by(LeaveRequest.created_at.desc()).limit(SERIALIZATION_ROWS).all()
+    # Relationships are loaded up front so both variants measure serialization only
+    serialize_leave_requests(rows)
+
+    return [
+        ('serialize_leave_requests_to_dict', lambda: json.dumps([lr.to_dict() for lr in rows])),
+        ('serialize_leave_requests_compiled', lambda: app.json.dumps(serialize_leave_requests(rows)))
+    ]
+
+def _measure(engine, action, iterations, warmup):
+    for _ in range(warmup):
+        action()
+
+    latencies, queries, statuses = [], [], {}
+    for _ in range(iterations):
+        with QueryCounter(engine) as counter:
+            started = time.perf_counter()
+            response = action()
+            latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count)
+        status_code = getattr(response, 'status_code', None)
+        if status_code is not None:
+            statuses[status_code] = statuses.get(status_code, 0) + 1
+
+    # Peak memory from a separate traced run, so tracing overhead stays out of the latencies
+    tracemalloc.start()
+    try:
+        action()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'p50_ms': round(statistics.median(latencies), 3),
+        'p95_ms': round(_percentile(latencies, 95), 3),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'max_ms': round(max(latencies), 3),
+        'queries_median': statistics.median(queries),
+        'queries_max': max(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'status_codes': {str(code): count for code, count in sorted(statuses.items())}
+    }
+
+def run_benchmarks(app, iterations=50, warmup=5, only=None, upload_rows=500):
+    """Run each scenario in-process through the test client and return a JSON-ready report.
+
+    Scenarios mutate data (leave applications, approvals, attendance
+    uploads), so point the app at a dedicated benchmark database.
+    """
+    _install_bench_auth(app)
+    client = app.test_client()
+
+    # Set up inside an app context, but measure outside it: a request pushed
+    # under a live app context would reuse its session across requests
+    with app.app_context():
+        employee, manager, admin = _pick_subjects()
+        scenarios = _scenarios(app, client, employee, manager, admin, upload_rows)
+        engine = db.engine
+
+    results = {}
+    for name, action in scenarios:
+        if only and name not in only:
+            continue
+        results[name] = _measure(engine, action, iterations, warmup)
+        if name in QUERY_BUDGETS:
+            results[name]['query_budget'] = QUERY_BUDGETS[name]
+            results[name]['within_query_budget'] = results[name]['queries_max'] <= QUERY_BUDGETS[name]
+
+    # No requests are issued here, so measuring under the app context is fine
+    with app.app_context():
+        for name, action in _serialization_scenarios(app):
+            if only and name not in only:
+                continue
+            results[name] = _measure(engine, action, iterations, warmup)
+
+    return {
+        'meta': {
+            'git_commit': _git_commit(),
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'iterations': iterations,
+            'warmup': warmup
+        },
+        'results': results
+    }
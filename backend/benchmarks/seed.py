@@ -0,0 +1,212 @@
+import random
+import uuid
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from sqlalchemy import insert
+from app import db
+from app.models.user import User, Location
+from app.models.leave import LeaveType, LeaveBalance, LeaveRequest
+from app.models.holiday import Holiday, location_holidays
+from app.models.attendance import AttendanceRecord
+from app.services.attendance_rollup_service import AttendanceRollupService
+
+EMAIL_DOMAIN = 'bench.nexuspulse.local'
+
+LEAVE_TYPES = [
+    # code, name, days allocated per year
+    ('BENCH_ANNUAL', 'Annual Leave', 20),
+    ('BENCH_SICK', 'Sick Leave', 10),
+    ('BENCH_CASUAL', 'Casual Leave', 8)
+]
+
+ATTENDANCE_STATUSES = ['present', 'absent', 'half_day', 'on_leave']
+ATTENDANCE_WEIGHTS = [0.86, 0.04, 0.05, 0.05]
+
+INSERT_CHUNK_SIZE = 5000
+
+def _new_id():
+    return str(uuid.uuid4())
+
+def _weekdays(start, end):
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            yield day
+        day += timedelta(days=1)
+
+def _bulk_insert(table, rows):
+    for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.session.execute(insert(table), rows[i:i + INSERT_CHUNK_SIZE])
+
+def bench_email(index):
+    return f'user{index}@{EMAIL_DOMAIN}'
+
+def bench_admin_email():
+    return f'admin@{EMAIL_DOMAIN}'
+
+def seed_organization(locations=3, employees=500, span=8, years=2, holidays_per_year=10,
+                      requests_per_year=4, seed=42, progress=None):
+    """Insert a synthetic organization and return row counts per table.
+
+    Users form a tree where user ``i`` reports to user ``(i - 1) // span``, so
+    the org has ``log_span(employees)`` management levels; anyone with reports
+    gets the manager role. Attendance covers every weekday of the last
+    ``years`` years up to today, and balances agree with the seeded requests.
+    """
+    if User.query.filter(User.email == bench_admin_email()).first():
+        raise ValueError('Benchmark data is already present in this database')
+
+    rng = random.Random(seed)
+    today = date.today()
+    year_list = list(range(today.year - years + 1, today.year + 1))
+    counts = {}
+
+    def report(step):
+        if progress:
+            progress(step)
+
+    # Locations and their holidays
+    location_rows = [
+        {'id': _new_id(), 'name': f'Bench Location {i + 1}', 'country': 'Benchland',
+         'city': f'City {i + 1}', 'timezone': 'UTC', 'created_at': datetime.utcnow()}
+        for i in range(locations)
+    ]
+    _bulk_insert(Location.__table__, location_rows)
+    location_ids = [row['id'] for row in location_rows]
+
+    holiday_rows, link_rows = [], []
+    for location_id in location_ids:
+        for year in year_list:
+            weekdays = list(_weekdays(date(year, 1, 1), date(year, 12, 31)))
+            for n, holiday_date in enumerate(sorted(rng.sample(weekdays, holidays_per_year))):
+                holiday_id = _new_id()
+                holiday_rows.append({'id': holiday_id, 'name': f'Bench Holiday {n + 1}', 'date': holiday_date,
+                                     'is_mandatory': True, 'created_at': datetime.utcnow()})
+                link_rows.append({'id': _new_id(), 'location_id': location_id, 'holiday_id': holiday_id})
+    _bulk_insert(Holiday.__table__, holiday_rows)
+    _bulk_insert(location_holidays, link_rows)
+    counts['locations'] = len(location_rows)
+    counts['holidays'] = len(holiday_rows)
+    report('locations and holidays')
+
+    # Leave types are shared with real data by code, so reuse them when present
+    leave_types = {}
+    for code, name, allocation in LEAVE_TYPES:
+        leave_type = LeaveType.query.filter_by(code=code).first()
+        if leave_type is None:
+            leave_type = LeaveType(name=name, code=code)
+            db.session.add(leave_type)
+            db.session.flush()
+        leave_types[leave_type.id] = allocation
+
+    # Users: an admin plus the management tree
+    now = datetime.utcnow()
+    user_ids = [_new_id() for _ in range(employees)]
+    user_rows = [{
+        'id': _new_id(), 'email': bench_admin_email(), 'first_name': 'Bench', 'last_name': 'Admin',
+        'role': 'admin', 'manager_id': None, 'location_id': location_ids[0], 'is_active': True,
+        'created_at': now, 'updated_at': now
+    }]
+    for i, user_id in enumerate(user_ids):
+        has_reports = i * span + 1 < employees
+        user_rows.append({
+            'id': user_id,
+            'email': bench_email(i),
+            'first_name': f'First{i}',
+            'last_name': f'Last{i}',
+            'role': 'manager' if has_reports else 'employee',
+            'manager_id': user_ids[(i - 1) // span] if i > 0 else None,
+            'location_id': location_ids[i % locations],
+            'is_active': True,
+            'created_at': now,
+            'updated_at': now
+        })
+    _bulk_insert(User.__table__, user_rows)
+    counts['users'] = len(user_rows)
+    report('users')
+
+    # Leave requests, with balances derived from them
+    request_rows = []
+    balance_totals = {}
+    for i, user_id in enumerate(user_ids):
+        manager_id = user_ids[(i - 1) // span] if i > 0 else None
+        for year in year_list:
+            weekdays = list(_weekdays(date(year, 1, 1), date(year, 12, 31)))
+            for _ in range(requests_per_year):
+                leave_type_id = rng.choice(list(leave_types))
+                start = rng.choice(weekdays)
+                end = start + timedelta(days=rng.choice([0, 0, 1, 2]))
+                total_days = sum(1 for _ in _weekdays(start, end))
+                if start > today:
+                    status = rng.choice(['pending', 'pending', 'approved'])
+                else:
+                    status = rng.choices(['approved', 'rejected', 'cancelled'], [0.8, 0.1, 0.1])[0]
+
+                request_rows.append({
+                    'id': _new_id(), 'user_id': user_id, 'leave_type_id': leave_type_id,
+                    'start_date': start, 'end_date': end, 'total_days': total_days,
+                    'reason': 'Benchmark leave', 'status': status, 'applied_by_id': user_id,
+                    'approved_by_id': manager_id if status in ('approved', 'rejected') else None,
+                    'rejection_reason': 'Benchmark rejection' if status == 'rejected' else None,
+                    'created_at': now, 'updated_at': now
+                })
+
+                used, pending = balance_totals.get((user_id, leave_type_id, year), (0, 0))
+                if status == 'approved':
+                    used += total_days
+                elif status == 'pending':
+                    pending += total_days
+                balance_totals[(user_id, leave_type_id, year)] = (used, pending)
+    _bulk_insert(LeaveRequest.__table__, request_rows)
+    counts['leave_requests'] = len(request_rows)
+
+    balance_rows = []
+    for user_id in user_ids:
+        for leave_type_id, allocation in leave_types.items():
+            for year in year_list:
+                used, pending = balance_totals.get((user_id, leave_type_id, year), (0, 0))
+                balance_rows.append({
+                    'id': _new_id(), 'user_id': user_id, 'leave_type_id': leave_type_id, 'year': year,
+                    # Enough headroom that the apply benchmark never runs dry
+                    'total_allocated': Decimal(max(allocation, used + pending) + 50),
+                    'used': Decimal(used), 'pending': Decimal(pending),
+                    'created_at': now, 'updated_at': now
+                })
+    _bulk_insert(LeaveBalance.__table__, balance_rows)
+    counts['leave_balances'] = len(balance_rows)
+    db.session.commit()
+    report('leave requests and balances')
+
+    # Attendance: one row per user per weekday, committed per year to bound the transaction
+    counts['attendance_records'] = 0
+    for year in year_list:
+        days = list(_weekdays(date(year, 1, 1), min(date(year, 12, 31), today)))
+        rows = []
+        for user_id in user_ids:
+            statuses = rng.choices(ATTENDANCE_STATUSES, ATTENDANCE_WEIGHTS, k=len(days))
+            for day, status in zip(days, statuses):
+                row = {'id': _new_id(), 'user_id': user_id, 'date': day, 'status': status,
+                       'check_in_time': None, 'check_out_time': None, 'work_hours': None,
+                       'notes': None, 'created_at': now, 'updated_at': now}
+                if status in ('present', 'half_day'):
+                    hours = 8 if status == 'present' else 4
+                    check_in = datetime.combine(day, time(9, rng.randint(0, 59)))
+                    row.update({'check_in_time': check_in,
+                                'check_out_time': check_in + timedelta(hours=hours),
+                                'work_hours': Decimal(hours)})
+                rows.append(row)
+
+            if len(rows) >= INSERT_CHUNK_SIZE:
+                _bulk_insert(AttendanceRecord.__table__, rows)
+                counts['attendance_records'] += len(rows)
+                rows = []
+
+        _bulk_insert(AttendanceRecord.__table__, rows)
+        counts['attendance_records'] += len(rows)
+        db.session.commit()
+        report(f'attendance {year}')
+
+    counts['attendance_rollups'] = AttendanceRollupService.rebuild()
+    report('attendance rollup')
+
+    return counts
@@ -0,0 +1,88 @@
+"""Add attendance rollup, import job and resource version tables
+
+Revision ID: 3f8a2c1d9b70
+Revises:
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8a2c1d9b70'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _existing_tables():
+    # Offline (--sql) runs have no connection to inspect, so emit everything
+    if context.is_offline_mode():
+        return set()
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    # Databases created with db.create_all() from the current models already have these tables
+    existing = _existing_tables()
+
+    if 'attendance_monthly_rollup' not in existing:
+        op.create_table('attendance_monthly_rollup',
+            sa.Column('user_id', sa.String(length=36), nullable=False),
+            sa.Column('year', sa.Integer(), nullable=False),
+            sa.Column('month', sa.Integer(), nullable=False),
+            sa.Column('total_days', sa.Integer(), nullable=False),
+            sa.Column('present', sa.Integer(), nullable=False),
+            sa.Column('absent', sa.Integer(), nullable=False),
+            sa.Column('half_day', sa.Integer(), nullable=False),
+            sa.Column('on_leave', sa.Integer(), nullable=False),
+            sa.Column('total_work_hours', sa.Numeric(precision=7, scale=2), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('user_id', 'year', 'month')
+        )
+        op.create_index('ix_attendance_monthly_rollup_year_month', 'attendance_monthly_rollup',
+                        ['year', 'month'], unique=False)
+
+    if 'import_jobs' not in existing:
+        op.create_table('import_jobs',
+            sa.Column('id', sa.String(length=36), nullable=False),
+            sa.Column('kind', sa.Enum('users', 'attendance', name='import_job_kind'), nullable=False),
+            sa.Column('status', sa.Enum('queued', 'running', 'completed', 'failed', name='import_job_status'),
+                      nullable=False),
+            sa.Column('filename', sa.String(length=255), nullable=False),
+            sa.Column('file_path', sa.String(length=1024), nullable=False),
+            sa.Column('created_by_id', sa.String(length=36), nullable=True),
+            sa.Column('total_rows', sa.Integer(), nullable=True),
+            sa.Column('processed_rows', sa.Integer(), nullable=False),
+            sa.Column('successful', sa.Integer(), nullable=False),
+            sa.Column('failed', sa.Integer(), nullable=False),
+            sa.Column('errors', sa.JSON(), nullable=True),
+            sa.Column('error_message', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['created_by_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_import_jobs_status', 'import_jobs', ['status'], unique=False)
+
+    if 'resource_versions' not in existing:
+        op.create_table('resource_versions',
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('version', sa.BigInteger(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('name')
+        )
+
+
+def downgrade():
+    op.drop_table('resource_versions')
+    op.drop_index('ix_import_jobs_status', table_name='import_jobs')
+    op.drop_table('import_jobs')
+    op.drop_index('ix_attendance_monthly_rollup_year_month', table_name='attendance_monthly_rollup')
+    op.drop_table('attendance_monthly_rollup')
+    op.execute('DROP TYPE import_job_status')
+    op.execute('DROP TYPE import_job_kind')
@@ -0,0 +1,66 @@
+"""Add list, history and search indexes
+
+Revision ID: 8c4e1b7a2d53
+Revises: 3f8a2c1d9b70
+Create Date: 2026-10-17 10:05:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e1b7a2d53'
+down_revision = '3f8a2c1d9b70'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, create_index keyword arguments)
+INDEXES = [
+    ('ix_leave_requests_user_created', 'leave_requests', ['user_id', 'created_at'], {}),
+    ('ix_leave_requests_user_status_created', 'leave_requests', ['user_id', 'status', 'created_at'], {}),
+    ('ix_leave_requests_status_user', 'leave_requests', ['status', 'user_id'], {}),
+    ('ix_leave_requests_user_start_date', 'leave_requests', ['user_id', 'start_date'], {}),
+    ('ix_leave_balances_user_year', 'leave_balances', ['user_id', 'year'], {}),
+    ('ix_attendance_records_date', 'attendance_records', ['date'], {}),
+    ('ix_holidays_date', 'holidays', ['date'], {}),
+    ('ix_users_manager_id', 'users', ['manager_id'], {}),
+    ('ix_users_email_trgm', 'users', ['email'],
+     {'postgresql_using': 'gin', 'postgresql_ops': {'email': 'gin_trgm_ops'}}),
+    ('ix_users_first_name_trgm', 'users', ['first_name'],
+     {'postgresql_using': 'gin', 'postgresql_ops': {'first_name': 'gin_trgm_ops'}}),
+    ('ix_users_last_name_trgm', 'users', ['last_name'],
+     {'postgresql_using': 'gin', 'postgresql_ops': {'last_name': 'gin_trgm_ops'}}),
+    ('ix_users_email_prefix', 'users', [sa.text('lower(email) text_pattern_ops')], {}),
+    ('ix_users_first_name_prefix', 'users', [sa.text('lower(first_name) text_pattern_ops')], {}),
+    ('ix_users_last_name_prefix', 'users', [sa.text('lower(last_name) text_pattern_ops')], {}),
+]
+
+
+def _existing_indexes():
+    # Offline (--sql) runs have no connection to inspect, so emit everything
+    if context.is_offline_mode():
+        return set()
+    inspector = sa.inspect(op.get_bind())
+    return {index['name'] for table in {table for _, table, _, _ in INDEXES}
+            for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    # gin_trgm_ops comes from pg_trgm; autogenerate never emits this
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    existing = _existing_indexes()
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, and builds on large tables
+    # must not be cut off by the production statement_timeout
+    with op.get_context().autocommit_block():
+        op.execute('SET statement_timeout = 0')
+        for name, table, columns, kwargs in INDEXES:
+            if name not in existing:
+                op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, **kwargs)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,63 @@
+import uuid
+from datetime import date
+from decimal import Decimal
+from app import db
+from app.models.user import User, Location
+from app.models.leave import LeaveType, LeaveBalance, LeaveRequest
+
+def make_location(**overrides):
+    location = Location(**{'name': f'Office {uuid.uuid4().hex[:8]}', 'country': 'US', 'timezone': 'UTC', **overrides})
+    db.session.add(location)
+    db.session.flush()
+    return location
+
+def make_user(location, role='employee', manager=None, **overrides):
+    suffix = uuid.uuid4().hex[:8]
+    user = User(**{
+        'email': f'{role}.{suffix}@test.nexuspulse.local',
+        'first_name': role.title(),
+        'last_name': suffix,
+        'role': role,
+        'manager_id': manager.id if manager else None,
+        'location_id': location.id,
+        **overrides
+    })
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+def make_leave_type(code='ANNUAL', **overrides):
+    leave_type = LeaveType(**{'name': code.title(), 'code': code, 'requires_approval': True, **overrides})
+    db.session.add(leave_type)
+    db.session.flush()
+    return leave_type
+
+def make_balance(user, leave_type, year, total_allocated=20, used=0, pending=0):
+    balance = LeaveBalance(
+        user_id=user.id,
+        leave_type_id=leave_type.id,
+        year=year,
+        total_allocated=Decimal(total_allocated),
+        used=Decimal(used),
+        pending=Decimal(pending)
+    )
+    db.session.add(balance)
+    db.session.flush()
+    return balance
+
+def make_leave_request(user, leave_type, day=None, total_days=1, status='pending', **overrides):
+    day = day or date(date.today().year, 1, 2)
+    leave_request = LeaveRequest(**{
+        'user_id': user.id,
+        'leave_type_id': leave_type.id,
+        'start_date': day,
+        'end_date': day,
+        'total_days': Decimal(total_days),
+        'reason': 'Test',
+        'status': status,
+        'applied_by_id': user.id,
+        **overrides
+    })
+    db.session.add(leave_request)
+    db.session.flush()
+    return leave_request
@@ -0,0 +1,21 @@
+from datetime import date
+from app.models.attendance import AttendanceMonthlyRollup, AttendanceRecord
+from app.services.attendance_rollup_service import AttendanceRollupService
+from tests.factories import make_location, make_user
+
+def test_refresh_counts_records_and_drops_emptied_months(db):
+    employee = make_user(make_location())
+    day = date(2026, 3, 2)
+    record = AttendanceRecord(user_id=employee.id, date=day, status='present', work_hours=8)
+    db.session.add(record)
+    AttendanceRollupService.refresh([(employee.id, day)])
+    db.session.commit()
+
+    rollup = db.session.get(AttendanceMonthlyRollup, (employee.id, 2026, 3))
+    assert (rollup.total_days, rollup.present, float(rollup.total_work_hours)) == (1, 1, 8.0)
+
+    db.session.delete(record)
+    AttendanceRollupService.refresh([(employee.id, day)])
+    db.session.commit()
+
+    assert db.session.get(AttendanceMonthlyRollup, (employee.id, 2026, 3)) is None
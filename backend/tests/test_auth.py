@@ -0,0 +1,74 @@
+import json
+import time
+from types import SimpleNamespace
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+from app.auth import SigningKeyCache, fetch_realm_signing_keys
+from app.utils.token_cache import VerifiedTokenCache, verified_tokens
+
+def _jwk(private_key, kid, **extra):
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({'kid': kid, 'use': 'sig', 'alg': 'RS256', **extra})
+    return jwk
+
+class FakeKeycloak:
+    def __init__(self, keys):
+        self.keys = keys
+        self.calls = 0
+
+    def certs(self):
+        self.calls += 1
+        return {'keys': self.keys}
+
+def _cache_get(cache, kid, realm):
+    return cache.get(kid, fetch=lambda: fetch_realm_signing_keys(realm), ttl=300, max_stale=3600,
+                     min_refetch_interval=10)
+
+def test_signing_key_from_jwks_verifies_token():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    realm = FakeKeycloak([
+        _jwk(private_key, 'sig-key'),
+        _jwk(rsa.generate_private_key(public_exponent=65537, key_size=2048), 'enc-key', use='enc')
+    ])
+    cache = SigningKeyCache()
+
+    public_key = _cache_get(cache, 'sig-key', realm)
+
+    token = jwt.encode({'sub': 'user-1', 'exp': int(time.time()) + 60}, private_key, algorithm='RS256',
+                       headers={'kid': 'sig-key'})
+    claims = jwt.decode(token, key=public_key, algorithms=['RS256'], options={'verify_aud': False})
+    assert claims['sub'] == 'user-1'
+
+    # Cached keys are served without another fetch
+    assert _cache_get(cache, 'sig-key', realm) is public_key
+    assert realm.calls == 1
+
+    # Encryption keys are skipped; the miss forces one refetch, then is rate limited
+    assert _cache_get(cache, 'enc-key', realm) is None
+    assert _cache_get(cache, 'enc-key', realm) is None
+    assert realm.calls == 2
+
+def test_unknown_kid_refetches_for_rotated_keys():
+    old_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    new_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    realm = FakeKeycloak([_jwk(old_key, 'old')])
+    cache = SigningKeyCache()
+    assert _cache_get(cache, 'old', realm) is not None
+
+    realm.keys = [_jwk(new_key, 'new')]
+    assert _cache_get(cache, 'new', realm) is not None
+    assert realm.calls == 2
+
+def test_token_cache_is_sized_from_app_config(app):
+    assert verified_tokens.maxsize == app.config['TOKEN_CACHE_MAX_SIZE']
+
+    cache = VerifiedTokenCache()
+    expires = time.time() + 60
+    for token in ('a', 'b', 'c'):
+        cache.put('keycloak', token, {'exp': expires})
+
+    cache.init_app(SimpleNamespace(config={'TOKEN_CACHE_MAX_SIZE': 2}))
+    assert cache.stats()['size'] == 2
+    assert cache.get('keycloak', 'a') is None
+    assert cache.get('keycloak', 'c') is not None
@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+from benchmarks.runner import QueryCounter
+from tests.conftest import auth_headers, signed_auth_headers
+from tests.factories import make_balance, make_leave_request, make_leave_type, make_location, make_user
+
+def _team_with_pending_leave(db, count, team_size=10, auth=auth_headers):
+    location = make_location()
+    manager = make_user(location, role='manager')
+    leave_type = make_leave_type()
+    year = date.today().year
+    team = [make_user(location, manager=manager) for _ in range(team_size)]
+    for member in team:
+        make_balance(member, leave_type, year, pending=count)
+
+    start = date(year, 1, 1)
+    leave_ids = [
+        make_leave_request(team[i % team_size], leave_type, day=start + timedelta(days=i // team_size)).id
+        for i in range(count)
+    ]
+    headers = auth(manager)
+    db.session.commit()
+    # Requests then start from an empty identity map, as they would in production
+    db.session.remove()
+    return headers, leave_ids
+
+def _decide(client, db, headers, leave_ids):
+    decisions = [
+        {'leave_id': leave_id, 'decision': 'approve'} if i % 2 else
+        {'leave_id': leave_id, 'decision': 'reject', 'rejection_reason': 'Coverage'}
+        for i, leave_id in enumerate(leave_ids)
+    ]
+    with QueryCounter(db.engine) as counter:
+        response = client.post('/api/manager/leave/bulk-decision', headers=headers, json={'decisions': decisions})
+    db.session.remove()
+    assert response.status_code == 200
+    return response.get_json(), counter.count
+
+def test_bulk_decision_query_count_is_flat(client, db):
+    headers, leave_ids = _team_with_pending_leave(db, 110)
+
+    small, small_queries = _decide(client, db, headers, leave_ids[:10])
+    large, large_queries = _decide(client, db, headers, leave_ids[10:])
+
+    assert small['successful'] == 10
+    assert large['successful'] == 100
+    assert small_queries == large_queries
+
+def test_bulk_decision_returns_decided_requests(client, db):
+    headers, leave_ids = _team_with_pending_leave(db, 2, team_size=1)
+
+    body, _ = _decide(client, db, headers, leave_ids)
+
+    rejected, approved = [r['leave_request'] for r in body['results']]
+    assert rejected['status'] == 'rejected'
+    assert rejected['rejection_reason'] == 'Coverage'
+    assert approved['status'] == 'approved'
+    assert approved['employee']['id'] == approved['user_id']
+
+def test_bulk_decision_authenticates_through_token_required(client, db):
+    headers, leave_ids = _team_with_pending_leave(db, 1, team_size=1, auth=signed_auth_headers)
+    body = {'decisions': [{'leave_id': leave_ids[0], 'decision': 'approve'}]}
+
+    assert client.post('/api/manager/leave/bulk-decision', json=body).status_code == 401
+    response = client.post('/api/manager/leave/bulk-decision', headers=headers, json=body)
+    assert response.status_code == 200
+    assert response.get_json()['successful'] == 1
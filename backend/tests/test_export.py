@@ -0,0 +1,46 @@
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from app.models.attendance import AttendanceRecord
+from app.models.leave import LeaveRequest, LeaveType
+from app.models.user import User
+from app.utils.export import _flatten
+from app.utils.serializers import (
+    attendance_export_columns, leave_request_export_columns, serialize_attendance_records,
+    serialize_leave_requests, serialize_users, user_export_columns
+)
+
+NOW = datetime(2026, 3, 2, 9, 0)
+
+def _user():
+    return User(id='u1', email='ada@example.com', first_name='Ada', last_name='Lovelace', role='employee',
+                location_id='l1', is_active=True, created_at=NOW, updated_at=NOW)
+
+def _leave_request():
+    leave_request = LeaveRequest(id='r1', user_id='u1', leave_type_id='t1', start_date=date(2026, 3, 2),
+                                 end_date=date(2026, 3, 2), total_days=Decimal('1'), reason='Trip',
+                                 status='pending', applied_by_id='u1', created_at=NOW, updated_at=NOW)
+    leave_request.leave_type = LeaveType(id='t1', name='Annual', code='ANNUAL', requires_approval=True)
+    leave_request.employee = _user()
+    return leave_request
+
+def _attendance_record():
+    record = AttendanceRecord(id='a1', user_id='u1', date=date(2026, 3, 2), status='present',
+                              created_at=NOW, updated_at=NOW)
+    record.user = _user()
+    return record
+
+@pytest.mark.parametrize('fields', [None, ('status', 'employee'), ('leave_type',), ('start_date',)])
+def test_leave_request_columns_match_serializer(fields):
+    row = _flatten(serialize_leave_requests([_leave_request()], fields=fields)[0])
+    assert list(row) == list(leave_request_export_columns(fields=fields))
+
+@pytest.mark.parametrize('fields', [None, ('date', 'employee'), ('status',)])
+def test_attendance_columns_match_serializer(fields):
+    row = _flatten(serialize_attendance_records([_attendance_record()], include_user=True, fields=fields)[0])
+    assert list(row) == list(attendance_export_columns(include_user=True, fields=fields))
+
+@pytest.mark.parametrize('fields', [None, ('email', 'full_name'), ('role',)])
+def test_user_columns_match_serializer(fields):
+    row = _flatten(serialize_users([_user()], fields=fields)[0])
+    assert list(row) == list(user_export_columns(fields))
@@ -0,0 +1,94 @@
+from datetime import date, datetime, timedelta
+import pytest
+from sqlalchemy import text
+from app.models.attendance import AttendanceRecord
+from app.models.holiday import Holiday, location_holidays
+from app.models.leave import LeaveBalance, LeaveRequest
+from app.models.user import Location
+from app.utils.dates import in_date_window
+from tests.conftest import query_plan
+from tests.factories import make_leave_type, make_location, make_user
+
+YEAR = 2024
+STATUSES = ('pending', 'approved', 'rejected', 'cancelled')
+
+@pytest.fixture
+def history(db):
+    """Enough per-user history that the planner has to choose between the indexes"""
+    location = make_location()
+    users = [make_user(location) for _ in range(20)]
+    leave_types = [make_leave_type('ANNUAL'), make_leave_type('SICK')]
+    
+    holidays = [Holiday(name=f'Holiday {year}-{day}', date=date(year, 1, 1) + timedelta(days=day * 15))
+                for year in range(YEAR - 9, YEAR + 1) for day in range(20)]
+    db.session.add_all(holidays)
+    db.session.flush()
+    db.session.execute(location_holidays.insert(),
+                       [{'location_id': location.id, 'holiday_id': holiday.id} for holiday in holidays])
+    
+    attendance, leave_requests, balances = [], [], []
+    created = datetime(YEAR - 1, 1, 1)
+    for user in users:
+        attendance += [{'user_id': user.id, 'date': date(YEAR, 1, 1) + timedelta(days=day), 'status': 'present'}
+                       for day in range(120)]
+        for i in range(24):
+            day = date(YEAR - 1 + i % 2, 1 + i // 2, 10)
+            leave_requests.append({
+                'user_id': user.id, 'leave_type_id': leave_types[i % 2].id, 'start_date': day, 'end_date': day,
+                'total_days': 1, 'reason': 'Test', 'status': STATUSES[i % 4], 'applied_by_id': user.id,
+                'created_at': created + timedelta(days=i * 15)
+            })
+        balances += [{'user_id': user.id, 'leave_type_id': leave_type.id, 'year': year, 'total_allocated': 20}
+                     for leave_type in leave_types for year in range(YEAR - 2, YEAR + 1)]
+    
+    db.session.execute(db.insert(AttendanceRecord), attendance)
+    db.session.execute(db.insert(LeaveRequest), leave_requests)
+    db.session.execute(db.insert(LeaveBalance), balances)
+    db.session.commit()
+    
+    for table in ('holidays', 'location_holidays', 'attendance_records', 'leave_requests', 'leave_balances'):
+        db.session.execute(text(f'ANALYZE {table}'))
+    return users[0], location
+
+def test_leave_history_uses_user_created_index(db, history):
+    user, _ = history
+    statement = db.select(LeaveRequest).where(LeaveRequest.user_id == user.id).order_by(
+        LeaveRequest.created_at.desc(), LeaveRequest.id.desc()
+    ).limit(21)
+    
+    plan = query_plan(db, statement)
+    assert 'ix_leave_requests_user_created' in plan, plan
+
+def test_leave_history_by_status_uses_user_status_created_index(db, history):
+    user, _ = history
+    statement = db.select(LeaveRequest).where(
+        LeaveRequest.user_id == user.id, LeaveRequest.status == 'approved'
+    ).order_by(LeaveRequest.created_at.desc(), LeaveRequest.id.desc()).limit(21)
+    
+    plan = query_plan(db, statement)
+    assert 'ix_leave_requests_user_status_created' in plan, plan
+
+def test_leave_balances_use_user_year_index(db, history):
+    user, _ = history
+    statement = db.select(LeaveBalance).where(LeaveBalance.user_id == user.id, LeaveBalance.year == YEAR)
+    
+    plan = query_plan(db, statement)
+    assert 'ix_leave_balances_user_year' in plan, plan
+
+def test_attendance_history_uses_user_date_index(db, history):
+    user, _ = history
+    statement = db.select(AttendanceRecord).where(
+        AttendanceRecord.user_id == user.id, in_date_window(AttendanceRecord.date, YEAR, 2)
+    ).order_by(AttendanceRecord.date.desc(), AttendanceRecord.id.desc()).limit(32)
+    
+    plan = query_plan(db, statement)
+    assert '_user_date_uc' in plan, plan
+
+def test_holidays_by_year_use_date_index(db, history):
+    _, location = history
+    statement = db.select(Holiday).join(Holiday.locations).where(
+        Location.id == location.id, in_date_window(Holiday.date, YEAR)
+    ).order_by(Holiday.date)
+    
+    plan = query_plan(db, statement)
+    assert 'ix_holidays_date' in plan, plan
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+from app.models.job import ImportJob
+from app.services.job_service import JobService
+from tests.conftest import signed_auth_headers
+from tests.factories import make_location, make_user
+
+def _running_job(db, file_path, heartbeat):
+    job = ImportJob(kind='attendance', filename='upload.csv', file_path=str(file_path), status='running',
+                    started_at=heartbeat, processed_rows=500, updated_at=heartbeat)
+    db.session.add(job)
+    db.session.commit()
+    return job.id
+
+def test_recover_stale_requeues_or_fails_abandoned_jobs(db, tmp_path):
+    spooled = tmp_path / 'upload.csv'
+    spooled.write_text('user_id,date,status\n')
+    long_ago = datetime.utcnow() - timedelta(hours=1)
+
+    requeue_id = _running_job(db, spooled, long_ago)
+    fail_id = _running_job(db, tmp_path / 'missing.csv', long_ago)
+    alive_id = _running_job(db, spooled, datetime.utcnow())
+
+    assert JobService.recover_stale(stale_after=600) == (1, 1)
+
+    db.session.expire_all()
+    requeued = db.session.get(ImportJob, requeue_id)
+    assert (requeued.status, requeued.started_at, requeued.processed_rows) == ('queued', None, 0)
+    assert db.session.get(ImportJob, fail_id).status == 'failed'
+    assert db.session.get(ImportJob, alive_id).status == 'running'
+
+def test_job_status_authenticates_through_token_required(client, db, tmp_path):
+    admin = make_user(make_location(), role='admin')
+    job_id = _running_job(db, tmp_path / 'upload.csv', datetime.utcnow())
+
+    assert client.get(f'/api/admin/jobs/{job_id}').status_code == 401
+    response = client.get(f'/api/admin/jobs/{job_id}', headers=signed_auth_headers(admin))
+    assert response.status_code == 200
+    assert response.get_json()['processed_rows'] == 500
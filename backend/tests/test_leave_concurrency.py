@@ -0,0 +1,110 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from app import db as _db
+from app.models.leave import LeaveBalance, LeaveRequest
+from app.services.leave_service import LeaveService
+from tests.factories import make_balance, make_leave_type, make_location, make_user
+
+OPERATIONS = 400
+EMPLOYEES = 4
+ALLOCATED_DAYS = 15
+# Below the testing pool's 4 connections, leaving one for the balance monitor
+WORKERS = 3
+
+def _weekdays(start, count):
+    days = []
+    day = start
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+def test_concurrent_leave_operations_keep_balances_consistent(app, db):
+    year = date.today().year + 1
+    location = make_location()
+    manager = make_user(location, role='manager')
+    employees = [make_user(location, manager=manager) for _ in range(EMPLOYEES)]
+    leave_type = make_leave_type()
+    for employee in employees:
+        make_balance(employee, leave_type, year, total_allocated=ALLOCATED_DAYS)
+    manager_id, leave_type_id = manager.id, leave_type.id
+    employee_ids = [employee.id for employee in employees]
+    db.session.commit()
+    db.session.remove()
+
+    rng = random.Random(2026)
+    days = _weekdays(date(year, 1, 1), 60)
+    applied = []
+    applied_lock = threading.Lock()
+
+    def apply():
+        user_id = rng.choice(employee_ids)
+        start = rng.choice(days)
+        result = LeaveService.apply_leave(user_id, leave_type_id, start, start + timedelta(days=rng.choice((0, 0, 1))),
+                                          'Stress test')
+        if result['success']:
+            with applied_lock:
+                applied.append((result['leave_request']['id'], user_id))
+
+    def decide(action):
+        with applied_lock:
+            if not applied:
+                return
+            leave_id, user_id = rng.choice(applied)
+        if action == 'approve':
+            LeaveService.approve_leave(leave_id, manager_id)
+        elif action == 'reject':
+            LeaveService.reject_leave(leave_id, manager_id, 'Coverage')
+        else:
+            LeaveService.cancel_leave(leave_id, user_id)
+
+    operations = [apply] * (OPERATIONS // 2) + [
+        lambda action=action: decide(action) for action in ('approve', 'reject', 'cancel') * (OPERATIONS // 6)
+    ]
+    rng.shuffle(operations)
+
+    def run(operation):
+        with app.app_context():
+            try:
+                operation()
+            finally:
+                _db.session.remove()
+
+    lowest_available = []
+    done = threading.Event()
+
+    def monitor():
+        # Samples every balance while the operations run; available must never dip below zero
+        with app.app_context():
+            while not done.is_set():
+                lowest = _db.session.query(
+                    _db.func.min(LeaveBalance.total_allocated - LeaveBalance.used - LeaveBalance.pending)
+                ).filter(LeaveBalance.year == year).scalar()
+                lowest_available.append(lowest)
+                _db.session.rollback()
+            _db.session.remove()
+
+    monitor_thread = threading.Thread(target=monitor)
+    monitor_thread.start()
+    try:
+        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            # list() re-raises any exception from an operation
+            list(executor.map(run, operations))
+    finally:
+        done.set()
+        monitor_thread.join()
+
+    assert applied
+    assert min(lowest_available) >= 0
+
+    requests = LeaveRequest.query.filter(LeaveRequest.user_id.in_(employee_ids)).all()
+    assert any(lr.status != 'pending' for lr in requests)
+    for balance in LeaveBalance.query.filter_by(leave_type_id=leave_type_id, year=year).all():
+        mine = [lr for lr in requests if lr.user_id == balance.user_id]
+        assert balance.pending == sum((Decimal(lr.total_days) for lr in mine if lr.status == 'pending'), Decimal('0'))
+        assert balance.used == sum((Decimal(lr.total_days) for lr in mine if lr.status == 'approved'), Decimal('0'))
+        assert balance.total_allocated - balance.used - balance.pending >= 0
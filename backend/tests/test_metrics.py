@@ -0,0 +1,25 @@
+from types import SimpleNamespace
+from tests.conftest import signed_auth_headers
+
+def test_metrics_refused_without_configured_token(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', '')
+    assert app.test_client().get('/metrics').status_code == 403
+
+def test_metrics_requires_bearer_token(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', 'scrape-secret')
+    client = app.test_client()
+
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+
+    response = client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+    assert response.status_code == 200
+    assert 'http_requests_total' in response.get_data(as_text=True)
+
+def test_db_pool_stats_authenticate_through_token_required(app):
+    admin = SimpleNamespace(id='admin-1', email='admin@test.nexuspulse.local', role='admin')
+    client = app.test_client()
+
+    assert client.get('/api/admin/system/db-pool').status_code == 401
+    response = client.get('/api/admin/system/db-pool', headers=signed_auth_headers(admin))
+    assert response.status_code == 200
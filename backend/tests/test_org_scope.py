@@ -0,0 +1,38 @@
+from datetime import date
+from app.services.org_service import OrgService
+from tests.conftest import auth_headers
+from tests.factories import make_balance, make_leave_request, make_leave_type, make_location, make_user
+
+def _chain(db):
+    """director -> manager -> employee, with one pending request for the employee"""
+    location = make_location()
+    director = make_user(location, role='manager')
+    manager = make_user(location, role='manager', manager=director)
+    employee = make_user(location, manager=manager)
+    leave_type = make_leave_type()
+    make_balance(employee, leave_type, date.today().year, pending=1)
+    leave_request = make_leave_request(employee, leave_type, day=date(date.today().year, 1, 5))
+    return director, manager, employee, leave_request
+
+def test_reports_to_follows_scope(db):
+    director, manager, employee, _ = _chain(db)
+
+    assert OrgService.reports_to(employee.id, manager.id, 'direct')
+    assert not OrgService.reports_to(employee.id, director.id, 'direct')
+    assert OrgService.reports_to(employee.id, director.id, 'all')
+    assert not OrgService.reports_to(director.id, manager.id, 'all')
+
+def test_skip_level_actions_require_scope_all(client, db):
+    director, _, employee, leave_request = _chain(db)
+    headers = auth_headers(director)
+    leave_id, employee_id = leave_request.id, employee.id
+    db.session.commit()
+
+    assert client.get(f'/api/manager/team/{employee_id}/balance', headers=headers).status_code == 403
+    assert client.get(f'/api/manager/team/{employee_id}/balance?scope=all', headers=headers).status_code == 200
+    assert client.put(f'/api/manager/leave/{leave_id}/approve?scope=bogus', headers=headers).status_code == 400
+    assert client.put(f'/api/manager/leave/{leave_id}/approve', headers=headers).status_code == 403
+
+    response = client.put(f'/api/manager/leave/{leave_id}/approve?scope=all', headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'approved'
@@ -0,0 +1,59 @@
+from datetime import date, timedelta
+from app.models.attendance import AttendanceMonthlyRollup, AttendanceRecord
+from app.models.holiday import Holiday
+from app.services.overview_service import OVERVIEW_QUERY_BUDGET
+from benchmarks.runner import QueryCounter
+from tests.conftest import auth_headers
+from tests.factories import make_balance, make_leave_request, make_leave_type, make_location, make_user
+
+def _seed_employee(db, leave_types, requests_per_type, holidays):
+    today = date.today()
+    location = make_location()
+    employee = make_user(location)
+    for i in range(leave_types):
+        leave_type = make_leave_type(code=f'{employee.last_name.upper()}_{i}')
+        make_balance(employee, leave_type, today.year)
+        for j in range(requests_per_type):
+            make_leave_request(employee, leave_type, day=today + timedelta(days=j + 1),
+                               status='pending' if j % 2 else 'approved')
+
+    db.session.add(AttendanceRecord(user_id=employee.id, date=today, status='present'))
+    db.session.add(AttendanceMonthlyRollup(user_id=employee.id, year=today.year, month=today.month,
+                                           total_days=1, present=1))
+    for i in range(holidays):
+        holiday = Holiday(name=f'Holiday {i}', date=today + timedelta(days=i + 1))
+        holiday.locations.append(location)
+        db.session.add(holiday)
+
+    headers = auth_headers(employee)
+    db.session.commit()
+    db.session.remove()
+    return headers
+
+def _overview_queries(client, db, headers):
+    with QueryCounter(db.engine) as counter:
+        response = client.get('/api/employee/overview', headers=headers)
+    db.session.remove()
+    assert response.status_code == 200
+    return response.get_json(), counter.count
+
+def test_overview_stays_within_query_budget(client, db):
+    headers = _seed_employee(db, leave_types=1, requests_per_type=2, holidays=1)
+
+    body, queries = _overview_queries(client, db, headers)
+
+    assert queries <= OVERVIEW_QUERY_BUDGET
+    assert body['today_attendance']['status'] == 'present'
+    assert body['attendance_this_month']['present'] == 1
+    assert len(body['upcoming_holidays']) == 1
+
+def test_overview_query_count_does_not_grow_with_data(client, db):
+    small = _seed_employee(db, leave_types=1, requests_per_type=1, holidays=1)
+    large = _seed_employee(db, leave_types=5, requests_per_type=10, holidays=10)
+
+    _, small_queries = _overview_queries(client, db, small)
+    body, large_queries = _overview_queries(client, db, large)
+
+    assert large_queries == small_queries <= OVERVIEW_QUERY_BUDGET
+    assert len(body['balances']) == 5
+    assert len(body['pending_requests']) + len(body['upcoming_leave']) == 50
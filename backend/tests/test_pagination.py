@@ -0,0 +1,61 @@
+import base64
+import json
+import uuid
+from datetime import date, datetime
+import pytest
+from app.models.attendance import AttendanceRecord
+from app.models.leave import LeaveBalance, LeaveRequest
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+LEAVE_KEYSET = [LeaveRequest.created_at, LeaveRequest.id]
+
+def _raw_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii').rstrip('=')
+
+def test_round_trip_restores_column_types():
+    leave_id = str(uuid.uuid4())
+    created_at = datetime(2026, 3, 1, 9, 30, 15, 120000)
+
+    assert decode_cursor(encode_cursor([created_at, leave_id]), LEAVE_KEYSET) == [created_at, leave_id]
+    assert decode_cursor(encode_cursor([date(2026, 3, 1), leave_id]),
+                         [AttendanceRecord.date, AttendanceRecord.user_id]) == [date(2026, 3, 1), leave_id]
+
+@pytest.mark.parametrize('values', [
+    ['2026-03-01T09:30:15', 'not-a-uuid'],
+    ['2026-03-01T09:30:15', str(uuid.uuid4()) + 'x'],
+    ['2026-03-01T09:30:15', 'a' * 10000],
+    ['2026-03-01T09:30:15', '00000000-0000-0000-0000-00000000\x00000'],
+    ['2026-03-01T09:30:15', 42],
+    ['2026-03-01T09:30:15', None],
+    ['yesterday', str(uuid.uuid4())],
+    [1700000000, str(uuid.uuid4())],
+    [['2026-03-01'], str(uuid.uuid4())],
+    [{'$gt': ''}, str(uuid.uuid4())],
+    ['2026-03-01T09:30:15'],
+    ['2026-03-01T09:30:15', str(uuid.uuid4()), 'extra'],
+    {'created_at': '2026-03-01T09:30:15'}
+])
+def test_tampered_cursor_is_rejected(values):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(_raw_cursor(values), LEAVE_KEYSET)
+
+@pytest.mark.parametrize('cursor', ['', '!!!', 'e30', base64.urlsafe_b64encode(b'\xff\xfe').decode('ascii')])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, LEAVE_KEYSET)
+
+@pytest.mark.parametrize('value', [True, 2 ** 31, -(2 ** 31) - 1, 2026.5, '2026'])
+def test_integer_column_rejects_out_of_range_or_wrong_type(value):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(_raw_cursor([value]), [LeaveBalance.year])
+
+def test_numeric_column_accepts_numbers_and_rejects_non_finite():
+    assert str(decode_cursor(_raw_cursor(['2.50']), [LeaveBalance.used])[0]) == '2.50'
+    for value in ['NaN', 'Infinity', 'abc', True]:
+        with pytest.raises(InvalidCursor):
+            decode_cursor(_raw_cursor([value]), [LeaveBalance.used])
+
+def test_enum_column_only_accepts_declared_values():
+    assert decode_cursor(_raw_cursor(['approved']), [LeaveRequest.status]) == ['approved']
+    with pytest.raises(InvalidCursor):
+        decode_cursor(_raw_cursor(['approved; drop']), [LeaveRequest.status])
@@ -0,0 +1,85 @@
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+from app.models.leave import LeaveBalance, LeaveRequest
+from app.services.leave_service import LeaveService
+from app.services.reconciliation_service import ReconciliationService
+from tests.conftest import signed_auth_headers
+from tests.factories import make_balance, make_leave_request, make_leave_type, make_location, make_user
+
+STALE_DAYS = 3
+REQUESTS = 40
+DECIDERS = 2
+
+def _weekdays(start, count):
+    days = []
+    day = start
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+def _run_concurrently(app, *targets):
+    errors = []
+
+    def run(target):
+        with app.app_context():
+            try:
+                target()
+            except Exception as e:  # surfaced to the test thread below
+                errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+def test_reconcile_concurrent_with_decisions_keeps_balances_consistent(app, db):
+    year = date.today().year + 1
+    location = make_location()
+    manager = make_user(location, role='manager')
+    employee = make_user(location, manager=manager)
+    leave_type = make_leave_type()
+    make_balance(employee, leave_type, year, total_allocated=STALE_DAYS * REQUESTS, pending=STALE_DAYS * REQUESTS)
+
+    # Every request is a single weekday recorded as STALE_DAYS, so each reconcile pass has work to do
+    leave_ids = [
+        make_leave_request(employee, leave_type, day=day, total_days=STALE_DAYS).id
+        for day in _weekdays(date(year, 1, 1), REQUESTS)
+    ]
+    manager_id, employee_id, leave_type_id = manager.id, employee.id, leave_type.id
+    db.session.commit()
+    db.session.remove()
+
+    def reconcile():
+        for _ in range(5):
+            ReconciliationService.reconcile_leave_totals()
+
+    def decide(share):
+        for i, leave_id in enumerate(share):
+            if i % 2:
+                LeaveService.approve_leave(leave_id, manager_id)
+            else:
+                LeaveService.reject_leave(leave_id, manager_id, 'Coverage')
+
+    shares = [leave_ids[i::DECIDERS] for i in range(DECIDERS)]
+    _run_concurrently(app, reconcile, *[lambda share=share: decide(share) for share in shares])
+
+    balance = LeaveBalance.query.filter_by(user_id=employee_id, leave_type_id=leave_type_id, year=year).one()
+    requests = LeaveRequest.query.filter_by(user_id=employee_id).all()
+    assert all(lr.status in ('approved', 'rejected') for lr in requests)
+
+    approved = [lr for lr in requests if lr.status == 'approved']
+    assert balance.pending == 0
+    assert balance.used == sum((Decimal(lr.total_days) for lr in approved), Decimal('0'))
+
+def test_reconcile_endpoint_authenticates_through_token_required(client, db):
+    admin = make_user(make_location(), role='admin')
+    db.session.commit()
+
+    assert client.post('/api/admin/leave/reconcile', json={}).status_code == 401
+    response = client.post('/api/admin/leave/reconcile', headers=signed_auth_headers(admin), json={})
+    assert response.status_code == 200
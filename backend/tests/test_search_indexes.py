@@ -0,0 +1,33 @@
+import pytest
+from app.models.user import User
+from app.utils.search import user_prefix_filter, user_search_filter
+from tests.conftest import query_plan, signed_auth_headers
+from tests.factories import make_location, make_user
+
+@pytest.fixture
+def users(db):
+    location = make_location()
+    for _ in range(20):
+        make_user(location)
+    db.session.commit()
+    return location
+
+def test_substring_search_uses_trigram_indexes(db, users):
+    plan = query_plan(db, db.select(User.id).where(user_search_filter('ploy')))
+
+    for index in ('ix_users_email_trgm', 'ix_users_first_name_trgm', 'ix_users_last_name_trgm'):
+        assert index in plan, plan
+
+def test_prefix_search_uses_lower_pattern_indexes(db, users):
+    plan = query_plan(db, db.select(User.id).where(user_prefix_filter('Emp')))
+
+    for index in ('ix_users_email_prefix', 'ix_users_first_name_prefix', 'ix_users_last_name_prefix'):
+        assert index in plan, plan
+
+def test_suggest_authenticates_through_token_required(client, users):
+    admin = make_user(users, role='admin')
+
+    assert client.get('/api/admin/users/suggest?q=emp').status_code == 401
+    response = client.get('/api/admin/users/suggest?q=emp', headers=signed_auth_headers(admin))
+    assert response.status_code == 200
+    assert len(response.get_json()['suggestions']) == 10
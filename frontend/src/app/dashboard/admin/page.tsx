@@ -102,7 +102,7 @@ export default function AdminUsersPage() {
 
         try {
             await adminApi.bulkUploadUsers(file);
-            enqueueSnackbar('Users uploaded successfully', { variant: 'success' });
+            enqueueSnackbar('Upload accepted, users are being imported in the background', { variant: 'success' });
             setUploadDialogOpen(false);
             fetchUsers();
         } catch (error: any) {
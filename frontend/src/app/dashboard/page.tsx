@@ -12,7 +12,7 @@ import {
 import EventNoteIcon from '@mui/icons-material/EventNote';
 import AccessTimeIcon from '@mui/icons-material/AccessTime';
 import PeopleIcon from '@mui/icons-material/People';
-import { employeeApi } from '@/lib/api/employee';
+import { batchApi } from '@/lib/api/batch';
 import { useAuth } from '@/lib/auth/auth-context';
 
 export default function DashboardOverview() {
@@ -23,11 +23,17 @@ export default function DashboardOverview() {
     useEffect(() => {
         const fetchData = async () => {
             try {
-                const balanceData = await employeeApi.getLeaveBalance();
-                setLeaveBalance(balanceData);
+                const results = await batchApi.get([
+                    { id: 'balance', path: '/employee/balance' },
+                    { id: 'summary', path: '/employee/attendance/summary' },
+                ]);
 
-                const summaryData = await employeeApi.getAttendanceSummary();
-                setAttendanceSummary(summaryData);
+                if (results.balance?.status === 200) {
+                    setLeaveBalance(results.balance.body);
+                }
+                if (results.summary?.status === 200) {
+                    setAttendanceSummary(results.summary.body);
+                }
             } catch (error) {
                 console.error('Failed to fetch dashboard data', error);
             }
@@ -108,6 +108,11 @@ export const adminApi = {
     return response.data;
   },
 
+  getImportJob: async (jobId: string) => {
+    const response = await apiClient.get(`/admin/jobs/${jobId}`);
+    return response.data;
+  },
+
   getAttendanceDefaulters: async (params?: {
     month?: number;
     year?: number;
@@ -0,0 +1,27 @@
+import apiClient from './client';
+
+export interface BatchRequest {
+  id: string;
+  // Path relative to the API root, e.g. '/employee/balance'
+  path: string;
+  params?: Record<string, string | number | undefined>;
+}
+
+export interface BatchResponse<T = any> {
+  id: string;
+  status: number;
+  body?: T;
+  etag?: string;
+}
+
+export const batchApi = {
+  // Run several GET requests in one round trip; results are keyed by request id
+  get: async (requests: BatchRequest[]): Promise<Record<string, BatchResponse>> => {
+    const response = await apiClient.post('/batch', {
+      requests: requests.map((r) => ({ ...r, path: `/api${r.path}` })),
+    });
+    return Object.fromEntries(
+      (response.data.responses as BatchResponse[]).map((r) => [r.id, r])
+    );
+  },
+};
@@ -3,16 +3,19 @@ import { User } from '@/types/user';
 import { LeaveRequest, ApplyLeaveRequest } from '@/types/leave';
 import { AttendanceRecord, AttendanceSummary } from '@/types/attendance';
 
+// 'direct' is the manager's own team, 'all' the whole reporting subtree
+export type TeamScope = 'direct' | 'all';
+
 export const managerApi = {
   // Team Management
-  getTeam: async () => {
-    const response = await apiClient.get('/manager/team');
+  getTeam: async (scope?: TeamScope) => {
+    const response = await apiClient.get('/manager/team', { params: { scope } });
     return response.data;
   },
 
   // Leave Management
-  getPendingLeaves: async () => {
-    const response = await apiClient.get('/manager/leave/pending');
+  getPendingLeaves: async (scope?: TeamScope) => {
+    const response = await apiClient.get('/manager/leave/pending', { params: { scope } });
     return response.data;
   },
 
@@ -22,30 +25,31 @@ export const managerApi = {
     year?: number;
     page?: number;
     per_page?: number;
+    scope?: TeamScope;
   }) => {
     const response = await apiClient.get('/manager/leave/history', { params });
     return response.data;
   },
 
-  approveLeave: async (leaveId: string): Promise<LeaveRequest> => {
-    const response = await apiClient.put(`/manager/leave/${leaveId}/approve`);
+  approveLeave: async (leaveId: string, scope?: TeamScope): Promise<LeaveRequest> => {
+    const response = await apiClient.put(`/manager/leave/${leaveId}/approve`, undefined, { params: { scope } });
     return response.data;
   },
 
-  rejectLeave: async (leaveId: string, rejectionReason: string): Promise<LeaveRequest> => {
+  rejectLeave: async (leaveId: string, rejectionReason: string, scope?: TeamScope): Promise<LeaveRequest> => {
     const response = await apiClient.put(`/manager/leave/${leaveId}/reject`, {
       rejection_reason: rejectionReason,
-    });
+    }, { params: { scope } });
     return response.data;
   },
 
-  applyLeaveOnBehalf: async (data: ApplyLeaveRequest): Promise<LeaveRequest> => {
-    const response = await apiClient.post('/manager/leave/apply', data);
+  applyLeaveOnBehalf: async (data: ApplyLeaveRequest, scope?: TeamScope): Promise<LeaveRequest> => {
+    const response = await apiClient.post('/manager/leave/apply', data, { params: { scope } });
     return response.data;
   },
 
-  getEmployeeBalance: async (userId: string, year?: number) => {
-    const response = await apiClient.get(`/manager/team/${userId}/balance`, { params: { year } });
+  getEmployeeBalance: async (userId: string, year?: number, scope?: TeamScope) => {
+    const response = await apiClient.get(`/manager/team/${userId}/balance`, { params: { year, scope } });
     return response.data;
   },
 
@@ -57,13 +61,14 @@ export const managerApi = {
     user_id?: string;
     page?: number;
     per_page?: number;
+    scope?: TeamScope;
   }) => {
     const response = await apiClient.get('/manager/team/attendance', { params });
     return response.data;
   },
 
-  getTeamAttendanceSummary: async (month?: number, year?: number) => {
-    const response = await apiClient.get('/manager/team/attendance/summary', { params: { month, year } });
+  getTeamAttendanceSummary: async (month?: number, year?: number, scope?: TeamScope) => {
+    const response = await apiClient.get('/manager/team/attendance/summary', { params: { month, year, scope } });
     return response.data;
   },
 
@@ -72,8 +77,8 @@ export const managerApi = {
     date: string;
     status: string;
     notes?: string;
-  }): Promise<AttendanceRecord> => {
-    const response = await apiClient.post('/manager/attendance/mark', data);
+  }, scope?: TeamScope): Promise<AttendanceRecord> => {
+    const response = await apiClient.post('/manager/attendance/mark', data, { params: { scope } });
     return response.data;
   },
 };